@@ -15,10 +15,12 @@ model_path = Path('models/onnx')
 datas = [
     (str(data_path / 'cat_noises.json'), 'data'),
     (str(data_path / 'embeddings.npy'), 'data'),
-    (str(data_path / 'noise_index.json'), 'data'),
     # Bundle the ONNX model for offline use (~90MB vs ~500MB for PyTorch)
     (str(model_path), 'models/onnx'),
 ]
+# Row-aligned noise index from generate_embeddings.py (falls back to cat_noises.json)
+if (data_path / 'noises.npz').exists():
+    datas.append((str(data_path / 'noises.npz'), 'data'))
 
 # Hidden imports for ONNX Runtime and all dependencies
 hiddenimports = [
@@ -27,6 +29,7 @@ hiddenimports = [
     'numpy',
     'numpy.core._methods',
     'numpy.lib.format',
+    'orjson',
     
     # Transformers and tokenizers
     'transformers',
@@ -99,6 +102,7 @@ hiddenimports = [
     'kittymode.error_handler',
     'kittymode.keyboard_listener',
     'kittymode.capture_window',
+    'kittymode.capture_window__mypyc',  # Present when build.py compiled it
     'kittymode.similarity_search',
     'kittymode.noise_selector',
     'kittymode.text_output',
@@ -4,43 +4,115 @@
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+def _find_pycache_dirs(root: str, skip: frozenset[str]) -> list[str]:
+    """Find __pycache__ directories under root without following symlinks.
+    
+    Args:
+        root: Directory to search
+        skip: Top-level directory names not to descend into
+        
+    Returns:
+        Paths of all __pycache__ directories found
+    """
+    found = []
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name == '__pycache__':
+                        found.append(entry.path)
+                    elif not (current == root and entry.name in skip):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    return found
+
+
+def _remove_dir(path: str) -> None:
+    """Remove a directory tree and report it."""
+    shutil.rmtree(path, ignore_errors=True)
+    print(f"Removed {path}/")
+
+
 def clean() -> None:
     """Clean build artifacts."""
-    dirs_to_remove = ['build', 'dist', '__pycache__']
-    for d in dirs_to_remove:
-        path = Path(d)
-        if path.exists():
-            shutil.rmtree(path)
-            print(f"Removed {d}/")
+    dirs_to_remove = ['build', 'dist']
+    paths = [d for d in dirs_to_remove if Path(d).exists()]
     
-    # Also clean pycache in subdirectories
-    for pycache in Path('.').rglob('__pycache__'):
-        shutil.rmtree(pycache)
-        print(f"Removed {pycache}/")
+    # Also clean pycache in all subdirectories (build/ and dist/ go anyway)
+    paths += _find_pycache_dirs('.', frozenset(dirs_to_remove))
+    
+    # rmtree is dominated by unlink latency, so overlap the independent trees
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_remove_dir, paths))
+
+
+# Modules on the per-keystroke path, compiled to C extensions with mypyc
+MYPYC_MODULES = ['kittymode/capture_window.py']
+
+
+def compile_hot_paths() -> list[Path]:
+    """Compile MYPYC_MODULES in place so PyInstaller bundles the extensions.
+    
+    Returns:
+        The generated extension files, to delete after the build (they
+        would otherwise shadow the .py sources when running from source)
+    """
+    try:
+        import mypyc  # noqa: F401
+    except ImportError:
+        print("mypyc not installed, bundling pure-Python modules")
+        return []
+    
+    print("Compiling hot paths with mypyc...")
+    src_dir = Path('src')
+    subprocess.run([sys.executable, '-m', 'mypyc', *MYPYC_MODULES], cwd=src_dir, check=True)
+    shutil.rmtree(src_dir / 'build', ignore_errors=True)
+    
+    artifacts = []
+    for module in MYPYC_MODULES:
+        module_path = src_dir / module
+        for pattern in (f'{module_path.stem}.*', f'{module_path.stem}__mypyc.*'):
+            artifacts += [
+                p for p in module_path.parent.glob(pattern)
+                if p.suffix in ('.so', '.pyd')
+            ]
+    return artifacts
+
+
+def run_pyinstaller(args: list[str]) -> None:
+    """Run PyInstaller in this interpreter, or in a subprocess as a fallback.
+    
+    Args:
+        args: Command-line arguments for PyInstaller
+    """
+    try:
+        from PyInstaller import __main__ as pyi_main
+    except ImportError:
+        subprocess.run([sys.executable, '-m', 'PyInstaller', *args], check=True)
+        return
+    pyi_main.run(args)
 
 
 def build_windows() -> None:
     """Build Windows executable."""
     print("Building for Windows...")
-    subprocess.run([
-        sys.executable, '-m', 'PyInstaller',
-        '--clean',
-        'kittymode.spec'
-    ], check=True)
+    run_pyinstaller(['--clean', 'kittymode.spec'])
     print("\n✓ Build complete: dist/KittyMode.exe")
 
 
 def build_macos() -> None:
     """Build macOS app bundle."""
     print("Building for macOS...")
-    subprocess.run([
-        sys.executable, '-m', 'PyInstaller',
-        '--clean',
-        'kittymode.spec'
-    ], check=True)
+    run_pyinstaller(['--clean', 'kittymode.spec'])
     print("\n✓ Build complete: dist/KittyMode.app")
 
 
@@ -61,6 +133,11 @@ def main() -> None:
         default='auto',
         help='Target platform (default: auto-detect)'
     )
+    parser.add_argument(
+        '--no-mypyc',
+        action='store_true',
+        help='Bundle capture_window as pure Python instead of compiling it'
+    )
     args = parser.parse_args()
     
     # Ensure we're in project root
@@ -81,10 +158,15 @@ def main() -> None:
         platform = 'windows' if sys.platform == 'win32' else 'macos'
     
     # Build
-    if platform == 'windows':
-        build_windows()
-    else:
-        build_macos()
+    compiled = [] if args.no_mypyc else compile_hot_paths()
+    try:
+        if platform == 'windows':
+            build_windows()
+        else:
+            build_macos()
+    finally:
+        for artifact in compiled:
+            artifact.unlink(missing_ok=True)
 
 
 if __name__ == '__main__':
@@ -1,19 +1,37 @@
 """Generate simple cat icons for the application."""
+import functools
+import hashlib
 import os
+import shutil
 from pathlib import Path
+from typing import Optional
 
 from PIL import Image, ImageDraw
 
+# Rendered PNGs, reused until this script changes
+CACHE_DIR = Path(__file__).parent.parent / 'assets' / '.icon_cache'
 
-def create_cat_icon(size: int, output_path: str) -> Image.Image:
-    """Create a simple cat face icon.
+# Larger icons are downscaled from one drawing at this size
+MASTER_SIZE = 1024
+
+# Small icons are drawn natively - pixel-snapped shapes stay crisper
+NATIVE_RENDER_MAX = 32
+
+
+@functools.lru_cache(maxsize=1)
+def _cache_key() -> str:
+    """Hash of this script, so editing the drawing code invalidates the cache."""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()[:8]
+
+
+def _draw_cat(size: int) -> Image.Image:
+    """Draw the cat face at the given size.
     
     Args:
         size: Icon size in pixels
-        output_path: Path to save the PNG
         
     Returns:
-        The created image
+        The drawn image
     """
     image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(image)
@@ -72,7 +90,54 @@ def create_cat_icon(size: int, output_path: str) -> Image.Image:
     draw.arc([int(24*s), int(46*s), int(32*s), int(54*s)], 0, 180, fill='black', width=max(1, int(s)))
     draw.arc([int(32*s), int(46*s), int(40*s), int(54*s)], 0, 180, fill='black', width=max(1, int(s)))
     
+    return image
+
+
+@functools.lru_cache(maxsize=1)
+def _master_image() -> Image.Image:
+    """Draw the cat once at MASTER_SIZE for downscaling to other sizes."""
+    return _draw_cat(MASTER_SIZE)
+
+
+def create_cat_icon(
+    size: int,
+    output_path: str,
+    render_native: Optional[bool] = None
+) -> Image.Image:
+    """Create a simple cat face icon.
+    
+    Reuses a previously rendered PNG from CACHE_DIR when available.
+    Otherwise the icon is downscaled from a single high-resolution master.
+    
+    Args:
+        size: Icon size in pixels
+        output_path: Path to save the PNG
+        render_native: Draw directly at this size instead of downscaling
+            (default: only for sizes up to NATIVE_RENDER_MAX)
+        
+    Returns:
+        The created image
+    """
+    if render_native is None:
+        render_native = size <= NATIVE_RENDER_MAX
+    
+    # Native and downscaled renders differ, so they're cached separately
+    mode = 'native' if render_native else 'scaled'
+    cached_path = CACHE_DIR / f'{_cache_key()}_{size}_{mode}.png'
+    if cached_path.exists():
+        shutil.copyfile(cached_path, output_path)
+        with Image.open(cached_path) as cached:
+            return cached.copy()
+    
+    if render_native or size == MASTER_SIZE:
+        image = _draw_cat(size)
+    else:
+        image = _master_image().resize((size, size), Image.LANCZOS)
+    
     image.save(output_path)
+    
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(output_path, cached_path)
     return image
 
 
@@ -1,5 +1,8 @@
 """Export sentence-transformers model to ONNX format for smaller, faster inference."""
 
+import functools
+import json
+import os
 import shutil
 from pathlib import Path
 
@@ -7,6 +10,29 @@
 import torch
 from transformers import AutoModel, AutoTokenizer
 
+from quantize_onnx import optimize_model, quantize_model
+
+# Number of cat noises used to calibrate activation ranges for static quantization
+CALIBRATION_SAMPLES = 128
+
+
+class MeanPooledModel(torch.nn.Module):
+    """Transformer followed by masked mean pooling over its tokens.
+    
+    Exporting this instead of the bare transformer puts the pooling in the
+    graph, so sessions return one (batch, dim) sentence embedding instead
+    of the full (batch, seq, dim) hidden state.
+    """
+    
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+    
+    def forward(self, input_ids, attention_mask):
+        hidden = self.model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+        mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+        return (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp_min(1e-9)
+
 
 def export_model():
     """Export all-MiniLM-L6-v2 to ONNX format."""
@@ -40,20 +66,37 @@ def export_model():
     print(f"Exporting ONNX model to {onnx_path}...")
     
     torch.onnx.export(
-        model,
+        MeanPooledModel(model),
         (inputs["input_ids"], inputs["attention_mask"]),
         str(onnx_path),
         input_names=["input_ids", "attention_mask"],
-        output_names=["last_hidden_state"],
+        output_names=["sentence_embedding"],
         dynamic_axes={
             "input_ids": {0: "batch_size", 1: "sequence"},
             "attention_mask": {0: "batch_size", 1: "sequence"},
-            "last_hidden_state": {0: "batch_size", 1: "sequence"},
+            "sentence_embedding": {0: "batch_size"},
         },
-        opset_version=14,
+        # Opset 17 has a native LayerNormalization op instead of ~8 primitives
+        opset_version=17,
         do_constant_folding=True,
     )
     
+    # Quantize MatMul/Gemm weights to INT8 (~4x smaller, int8 GEMM kernels)
+    int8_path = quantize_model(onnx_path, output_dir)
+    print(f"Quantized INT8 model saved to {int8_path}")
+    
+    # Half-precision variant for CPUs with native FP16 math
+    fp16_path = convert_fp16_model(onnx_path, output_dir)
+    print(f"FP16 model saved to {fp16_path}")
+    
+    # Static per-channel variant, checked against FP32 in test_inference
+    qdq_path = quantize_static_model(onnx_path, output_dir, tokenizer)
+    print(f"Static INT8 (QDQ) model saved to {qdq_path}")
+    
+    # Serialize the hardware-independent fused graph once so the app skips fusion at startup
+    opt_path = optimize_model(int8_path, output_dir)
+    print(f"Optimized runtime model saved to {opt_path}")
+    
     print(f"\n✓ Model exported to {output_dir}")
     
     # Print size
@@ -65,38 +108,166 @@ def export_model():
     test_inference(output_dir)
 
 
-def test_inference(model_dir: Path):
-    """Test that the ONNX model works correctly."""
-    import onnxruntime as ort
+def convert_fp16_model(onnx_path: Path, output_dir: Path) -> Path:
+    """Convert the FP32 model's weights and activations to FP16.
+    
+    Args:
+        onnx_path: Path to the exported FP32 model
+        output_dir: Directory to write model_fp16.onnx into
+        
+    Returns:
+        Path to the FP16 model
+    """
+    import onnx
+    from onnxconverter_common import float16
+    
+    fp16_path = output_dir / "model_fp16.onnx"
+    model = onnx.load(str(onnx_path))
+    # Keep int64 inputs and a float32 output so callers don't change
+    model_fp16 = float16.convert_float_to_float16(model, keep_io_types=True)
+    onnx.save(model_fp16, str(fp16_path))
+    return fp16_path
+
+
+class CatNoiseCalibrationReader:
+    """Feed tokenized cat noises to quantize_static for activation calibration.
+    
+    Implements onnxruntime.quantization.CalibrationDataReader.
+    """
+    
+    def __init__(self, tokenizer, num_samples: int = CALIBRATION_SAMPLES):
+        noises_path = Path(__file__).parent.parent / "data" / "cat_noises.json"
+        with open(noises_path, "r", encoding="utf-8") as f:
+            texts = [noise["text"] for noise in json.load(f)["noises"]]
+        
+        # Spread the samples across the whole file rather than the first few
+        step = max(1, len(texts) // num_samples)
+        self._texts = iter(texts[::step][:num_samples])
+        self._tokenizer = tokenizer
+    
+    def get_next(self):
+        """Get the next calibration input feed, or None when exhausted."""
+        text = next(self._texts, None)
+        if text is None:
+            return None
+        inputs = self._tokenizer(text, return_tensors="np", truncation=True)
+        return {
+            "input_ids": inputs["input_ids"],
+            "attention_mask": inputs["attention_mask"],
+        }
+
+
+def quantize_static_model(onnx_path: Path, output_dir: Path, tokenizer) -> Path:
+    """Statically quantize the FP32 model with per-channel INT8 weights.
+    
+    Args:
+        onnx_path: Path to the exported FP32 model
+        output_dir: Directory to write model_qdq.onnx into
+        tokenizer: Tokenizer used to build the calibration inputs
+        
+    Returns:
+        Path to the quantized model
+    """
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+    
+    qdq_path = output_dir / "model_qdq.onnx"
+    quantize_static(
+        str(onnx_path),
+        str(qdq_path),
+        calibration_data_reader=CatNoiseCalibrationReader(tokenizer),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+    )
+    return qdq_path
+
+
+@functools.lru_cache(maxsize=None)
+def get_tokenizer(model_dir: Path):
+    """Load the tokenizer saved alongside the exported model, once per directory.
+    
+    Args:
+        model_dir: Directory containing the tokenizer files
+        
+    Returns:
+        The loaded tokenizer
+    """
     from transformers import AutoTokenizer
     
-    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return AutoTokenizer.from_pretrained(model_dir)
+
+
+@functools.lru_cache(maxsize=None)
+def get_session(onnx_path: Path):
+    """Create an inference session for a model file, once per path.
+    
+    Args:
+        onnx_path: Path to the ONNX model
+        
+    Returns:
+        The onnxruntime.InferenceSession
+    """
+    import onnxruntime as ort
     
-    onnx_path = model_dir / "model.onnx"
-    session = ort.InferenceSession(str(onnx_path), providers=['CPUExecutionProvider'])
+    # Same threading setup as the app: a few threads, run sequentially
+    so = ort.SessionOptions()
+    so.intra_op_num_threads = max(1, min(4, (os.cpu_count() or 2) // 2))
+    so.inter_op_num_threads = 1
+    so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    so.add_session_config_entry("session.dynamic_block_base", "4")
+    return ort.InferenceSession(str(onnx_path), so, providers=['CPUExecutionProvider'])
+
+
+def test_inference(model_dir: Path):
+    """Test that the ONNX models work and the derived variants match FP32."""
+    tokenizer = get_tokenizer(model_dir)
     
     test_texts = ["meow", "hello world", "asdjfkl"]
+    # Tokenize once; every model variant sees the same inputs
+    tokenized = [
+        tokenizer(text, return_tensors="np", padding=True, truncation=True)
+        for text in test_texts
+    ]
     
-    for text in test_texts:
-        inputs = tokenizer(text, return_tensors="np", padding=True, truncation=True)
+    results = {}
+    variants = ("model_fp16.onnx", "model_int8.onnx", "model_qdq.onnx", "model_opt.onnx")
+    for model_file in ("model.onnx",) + variants:
+        onnx_path = model_dir / model_file
+        if not onnx_path.exists():
+            continue
+        session = get_session(onnx_path)
         
-        outputs = session.run(
-            None,
-            {
-                "input_ids": inputs["input_ids"],
-                "attention_mask": inputs["attention_mask"],
-            }
-        )
+        pooled_all = []
+        for text, inputs in zip(test_texts, tokenized):
+            outputs = session.run(
+                None,
+                {
+                    "input_ids": inputs["input_ids"],
+                    "attention_mask": inputs["attention_mask"],
+                }
+            )
+            
+            # The graph mean-pools, so this is already (batch, dim)
+            pooled = outputs[0]
+            pooled_all.append(pooled[0])
+            
+            print(f"  [{model_file}] '{text}' -> embedding shape: {pooled.shape}, "
+                  f"norm: {np.linalg.norm(pooled):.4f}")
         
-        # Mean pooling
-        embeddings = outputs[0]
-        attention_mask = inputs["attention_mask"]
-        mask_expanded = np.expand_dims(attention_mask, -1)
-        sum_embeddings = np.sum(embeddings * mask_expanded, axis=1)
-        sum_mask = np.sum(mask_expanded, axis=1)
-        pooled = sum_embeddings / sum_mask
-        
-        print(f"  '{text}' -> embedding shape: {pooled.shape}, norm: {np.linalg.norm(pooled):.4f}")
+        results[model_file] = pooled_all
+    
+    # Reduced precision, quantization and graph fusion must not noticeably
+    # change the embeddings
+    for model_file in variants:
+        if model_file not in results:
+            continue
+        for text, fp32, other in zip(test_texts, results["model.onnx"], results[model_file]):
+            cosine = float(np.dot(fp32, other) / (np.linalg.norm(fp32) * np.linalg.norm(other)))
+            norm_ratio = float(np.linalg.norm(other) / np.linalg.norm(fp32))
+            print(f"  '{text}' fp32 vs {model_file} cosine similarity: {cosine:.4f}, "
+                  f"norm ratio: {norm_ratio:.4f}")
+            assert cosine > 0.99, f"{model_file} diverges from FP32 on '{text}' ({cosine:.4f})"
     
     print("\n✓ ONNX model test passed!")
 
@@ -4,10 +4,97 @@
 until... POUNCE! Time to transform them into meows! 🐱
 """
 
+import heapq
+import itertools
+import logging
 import threading
 import time
 from typing import Callable, Optional
 
+logger = logging.getLogger('kittymode')
+
+
+class _Scheduler:
+    """One daemon thread that closes every CaptureWindow on a clock when it's due.
+    
+    A single cat keeping watch over all the mouse holes at once.
+    """
+    
+    def __init__(self, clock: Callable[[], float]):
+        """Initialize the scheduler; the thread starts with the first entry.
+        
+        Args:
+            clock: Returns the current time in seconds, like time.monotonic
+        """
+        self._clock = clock
+        # (deadline, sequence, window) entries, earliest first
+        self._heap: list[tuple[float, int, "CaptureWindow"]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+    
+    def schedule(self, window: "CaptureWindow", deadline: float) -> None:
+        """Ask for window._expire(deadline) to be called once deadline passes.
+        
+        Args:
+            window: The window to check
+            deadline: Clock reading to check it at
+        """
+        with self._cond:
+            heapq.heappush(self._heap, (deadline, next(self._counter), window))
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="CaptureWindow", daemon=True
+                )
+                self._worker.start()
+            self._cond.notify()
+    
+    def wake(self) -> None:
+        """Re-check the earliest deadline now, e.g. after the clock jumped."""
+        with self._cond:
+            self._cond.notify()
+    
+    def stop(self) -> None:
+        """End the worker thread, dropping any pending entries."""
+        with self._cond:
+            self._stopped = True
+            self._heap.clear()
+            self._cond.notify()
+    
+    def _run(self) -> None:
+        """Worker loop: sleep until the earliest deadline, then let its window close."""
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    remaining = self._heap[0][0] - self._clock()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                deadline, _, window = heapq.heappop(self._heap)
+            
+            # Outside our lock: the window takes its own lock and may call back.
+            # Every window on the clock depends on this thread, so a failing
+            # callback must not take it down
+            try:
+                later = window._expire(deadline)
+            except Exception as e:
+                logger.error(f"Error in capture window callback: {e}", exc_info=True)
+                continue
+            if later is not None:
+                self.schedule(window, later)
+
+
+# One scheduler per clock, shared by every window on it, started lazily. Kept
+# at module level: mypyc won't let class attributes be read through cls
+_schedulers: dict[Callable[[], float], _Scheduler] = {}
+_schedulers_lock = threading.Lock()
+
 
 class CaptureWindow:
     """Manages a time-based window for capturing keyboard input.
@@ -24,7 +111,8 @@ def __init__(
         window_duration_ms: int = 800,
         extension_threshold_ms: int = 200,
         max_duration_ms: int = 3000,
-        on_complete: Optional[Callable[[str, int], None]] = None
+        on_complete: Optional[Callable[[str, int], None]] = None,
+        clock: Callable[[], float] = time.monotonic
     ):
         """Initialize capture window.
         
@@ -33,18 +121,23 @@ def __init__(
             extension_threshold_ms: Extend window if keypress within this time of timeout
             max_duration_ms: Maximum total window duration
             on_complete: Callback function(captured_string, char_count) called when window closes
+            clock: Returns the current time in seconds; tests pass a fake
+                one and call clock_advanced after moving it
         """
         self.window_duration_ms = window_duration_ms
         self.extension_threshold_ms = extension_threshold_ms
         self.max_duration_ms = max_duration_ms
         self.on_complete = on_complete
+        self._clock = clock
         
         # State
-        self._buffer: list[str] = []
+        # UTF-8 bytes, decoded once when the window closes
+        self._buffer = bytearray()
         self._is_active = False
         self._start_time: Optional[float] = None
-        self._last_keypress_time: Optional[float] = None
-        self._timer: Optional[threading.Timer] = None
+        self._deadline: Optional[float] = None
+        # Deadline of this window's pending scheduler entry, if any
+        self._scheduled_for: Optional[float] = None
         self._lock = threading.Lock()
     
     def add_key(self, key_char: str) -> None:
@@ -54,47 +147,55 @@ def add_key(self, key_char: str) -> None:
             key_char: The character to add to the buffer
         """
         with self._lock:
-            current_time = time.time()
+            now = self._clock()
             
             # Add to buffer
-            self._buffer.append(key_char)
-            self._last_keypress_time = current_time
+            self._buffer.extend(key_char.encode('utf-8'))
             
             if not self._is_active:
                 # Start new window
                 self._is_active = True
-                self._start_time = current_time
-                self._schedule_close()
+                self._start_time = now
+                self._schedule_close(now)
             else:
                 # Check if we should extend the window
-                self._maybe_extend_window(current_time)
+                self._maybe_extend_window(now)
     
-    def _maybe_extend_window(self, current_time: float) -> None:
+    def _maybe_extend_window(self, now: Optional[float] = None) -> None:
         """Extend window if keypress is near timeout, within max duration.
         
         Args:
-            current_time: Current timestamp
+            now: Current clock reading, read fresh if omitted
         """
         if self._start_time is None:
             return
         
-        elapsed_ms = (current_time - self._start_time) * 1000
+        if now is None:
+            now = self._clock()
+        elapsed_ms = (now - self._start_time) * 1000
         
         # Check if we're within extension threshold of the scheduled close
         # and haven't exceeded max duration
         if elapsed_ms + self.extension_threshold_ms < self.max_duration_ms:
-            # Cancel existing timer and reschedule
-            if self._timer is not None:
-                self._timer.cancel()
-            self._schedule_close()
+            # Push the deadline back
+            self._schedule_close(now)
     
-    def _schedule_close(self) -> None:
-        """Schedule the window to close after the duration."""
+    def _schedule_close(self, now: Optional[float] = None) -> None:
+        """Schedule the window to close after the duration.
+        
+        Must be called with the lock held. Deadlines only move later, so an
+        extension just moves self._deadline; the pending scheduler entry
+        finds the new deadline when it comes due and re-arms itself.
+        
+        Args:
+            now: Current clock reading, read fresh if omitted
+        """
         if self._start_time is None:
             return
         
-        current_time = time.time()
-        elapsed_ms = (current_time - self._start_time) * 1000
+        if now is None:
+            now = self._clock()
+        elapsed_ms = (now - self._start_time) * 1000
         
         # Calculate remaining time, respecting max duration
         remaining_window_ms = self.window_duration_ms
@@ -104,30 +205,97 @@ def _schedule_close(self) -> None:
         delay_ms = min(remaining_window_ms, time_until_max)
         delay_s = max(delay_ms / 1000, 0.001)  # Minimum 1ms
         
-        self._timer = threading.Timer(delay_s, self._close_window)
-        self._timer.daemon = True
-        self._timer.start()
+        self._deadline = now + delay_s
+        
+        # A stale entry from a cancelled window may be due later than this one
+        if self._scheduled_for is None or self._deadline < self._scheduled_for:
+            self._scheduled_for = self._deadline
+            self._get_scheduler(self._clock).schedule(self, self._deadline)
     
-    def _close_window(self) -> None:
-        """Internal: close window and trigger callback."""
-        with self._lock:
-            if not self._is_active:
-                return
+    @classmethod
+    def _get_scheduler(cls, clock: Callable[[], float]) -> _Scheduler:
+        """Get the scheduler shared by all windows on a clock, creating it on first use.
+        
+        Args:
+            clock: The windows' clock
             
-            # Get captured string and count
-            captured = "".join(self._buffer)
-            char_count = len(self._buffer)
+        Returns:
+            The clock's scheduler
+        """
+        with _schedulers_lock:
+            scheduler = _schedulers.get(clock)
+            if scheduler is None:
+                scheduler = _schedulers[clock] = _Scheduler(clock)
+            return scheduler
+    
+    @classmethod
+    def clock_advanced(cls, clock: Callable[[], float]) -> None:
+        """Close any windows on a clock that are now due, after it jumped forward.
+        
+        Only needed for fake clocks; real time wakes the scheduler by itself.
+        
+        Args:
+            clock: The clock that was moved
+        """
+        cls._get_scheduler(clock).wake()
+    
+    @classmethod
+    def release_clock(cls, clock: Callable[[], float]) -> None:
+        """Stop and forget the scheduler for a clock that's no longer used.
+        
+        Meant for fake clocks, which would otherwise each keep an idle
+        scheduler thread around for the rest of the process.
+        
+        Args:
+            clock: The clock to release
+        """
+        with _schedulers_lock:
+            scheduler = _schedulers.pop(clock, None)
+        if scheduler is not None:
+            scheduler.stop()
+    
+    def _expire(self, scheduled_for: float) -> Optional[float]:
+        """Close the window if it's due; called by the scheduler.
+        
+        Args:
+            scheduled_for: Deadline the scheduler entry was made for
             
-            # Reset state
-            self._buffer = []
-            self._is_active = False
-            self._start_time = None
-            self._last_keypress_time = None
-            self._timer = None
+        Returns:
+            The deadline to check again at if the window was extended,
+            otherwise None
+        """
+        with self._lock:
+            if scheduled_for != self._scheduled_for:
+                # Superseded by an earlier entry
+                return None
+            self._scheduled_for = None
+            if self._deadline is None:
+                # Cancelled, or already closed
+                return None
+            if self._deadline > self._clock():
+                self._scheduled_for = self._deadline
+                return self._deadline
+            captured, char_count = self._reset()
         
         # Call callback outside lock to prevent deadlocks
         if self.on_complete is not None and captured:
             self.on_complete(captured, char_count)
+        return None
+    
+    def _reset(self) -> tuple[str, int]:
+        """Clear window state and return what was captured (lock must be held).
+        
+        Returns:
+            Tuple of (captured string, character count)
+        """
+        captured = self._buffer.decode('utf-8') if self._is_active else ""
+        char_count = len(captured)
+        
+        self._buffer.clear()
+        self._is_active = False
+        self._start_time = None
+        self._deadline = None
+        return captured, char_count
     
     def is_active(self) -> bool:
         """Check if capture window is currently active."""
@@ -137,10 +305,4 @@ def is_active(self) -> bool:
     def cancel(self) -> None:
         """Cancel the current capture window without triggering callback."""
         with self._lock:
-            if self._timer is not None:
-                self._timer.cancel()
-            self._buffer = []
-            self._is_active = False
-            self._start_time = None
-            self._last_keypress_time = None
-            self._timer = None
+            self._reset()
@@ -4,11 +4,20 @@
 style of meowing, and this is where we remember yours. Nya~
 """
 
+import atexit
+import copy
 import json
 import logging
 import os
+import pickle
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib if orjson didn't make it in
+    orjson = None
 
 from .platform_utils import is_windows, is_macos
 
@@ -25,9 +34,197 @@
     "press_enter_after": True,
     "hotkey": "ctrl+shift+k",
     "custom_noises": [],
+    "onnx_intra_op_threads": 0,  # 0 = min(4, half the CPU cores)
+    "onnx_inter_op_threads": 1,
+    "onnx_optimization_level": "auto",  # auto, basic, extended or all
     "version": "1.0"
 }
 
+# Quiet period before pending changes are written to disk
+SAVE_DEBOUNCE_S = 0.2
+
+
+def _compute_base_dir() -> Path:
+    """Get the platform-appropriate parent of the config directory.
+    
+    Returns:
+        Path to the per-user application data directory
+    """
+    if is_windows():
+        # Windows: %APPDATA%\KittyMode
+        return Path(os.environ.get('APPDATA', Path.home()))
+    elif is_macos():
+        # macOS: ~/Library/Application Support/KittyMode
+        return Path.home() / "Library" / "Application Support"
+    else:
+        # Linux: ~/.config/KittyMode
+        return Path.home() / ".config"
+
+
+# The platform can't change while we're running, so resolve it once
+_PLATFORM_BASE = _compute_base_dir()
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON, using orjson when available.
+    
+    Args:
+        data: UTF-8 encoded JSON
+        
+    Returns:
+        The decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON, using orjson when available.
+    
+    Args:
+        obj: Value to serialize
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _default_config() -> Dict[str, Any]:
+    """Get a fresh copy of the defaults that callers are free to modify.
+    
+    Returns:
+        Deep copy of DEFAULT_CONFIG, so the custom noise list isn't shared
+    """
+    return copy.deepcopy(DEFAULT_CONFIG)
+
+
+class JsonFileStorage:
+    """Keeps the config in a JSON file, with a pickled parse cache beside it.
+    
+    The cat's secret stash, buried where she can always dig it back up.
+    """
+    
+    def __init__(self, path: Path):
+        """Initialize the storage.
+        
+        Args:
+            path: Location of config.json
+        """
+        self.path = path
+        # Parsed copy of config.json, keyed by the file's (mtime, size)
+        self.cache_file = path.with_name(".config.cache")
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the stored config.
+        
+        Returns:
+            The parsed config, or None if nothing has been saved yet
+            
+        Raises:
+            ValueError: If the file isn't valid JSON
+            OSError: If the file can't be read
+        """
+        if not self.path.exists():
+            return None
+        key = self._file_key()
+        loaded = self._read_cache(key)
+        if loaded is None:
+            loaded = _loads(self.path.read_bytes())
+            self._write_cache(key, loaded)
+        return loaded
+    
+    def save(self, config: Dict[str, Any]) -> None:
+        """Atomically replace the stored config.
+        
+        Args:
+            config: The config to store
+            
+        Raises:
+            OSError: If the file can't be written
+        """
+        tmp_file = self.path.with_name(self.path.name + ".tmp")
+        tmp_file.write_bytes(_dumps(config))
+        os.replace(tmp_file, self.path)
+    
+    def _file_key(self) -> Tuple[int, int]:
+        """Get the (mtime, size) pair identifying the config file's contents.
+        
+        Returns:
+            Tuple of modification time in nanoseconds and size in bytes
+        """
+        stat = self.path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_cache(self, key: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        """Get the cached parsed config if it matches the config file.
+        
+        Args:
+            key: Current (mtime, size) of the config file
+            
+        Returns:
+            The cached config dict, or None if missing or stale
+        """
+        try:
+            with open(self.cache_file, 'rb') as f:
+                cached_key, cached_config = pickle.load(f)
+        except Exception as e:
+            # A damaged cache can fail in all sorts of ways; config.json
+            # is still there to fall back on
+            logger.debug(f"Ignoring unreadable config cache: {e}")
+            return None
+        return cached_config if cached_key == key else None
+    
+    def _write_cache(self, key: Tuple[int, int], config: Dict[str, Any]) -> None:
+        """Cache a parsed config for the given config file state.
+        
+        Args:
+            key: (mtime, size) of the config file the dict was read from
+            config: The parsed config
+        """
+        try:
+            with open(self.cache_file, 'wb') as f:
+                pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError) as e:
+            logger.debug(f"Could not write config cache: {e}")
+
+
+class DictStorage:
+    """Keeps the config in memory, for tests and throwaway sessions.
+    
+    A cat nap's worth of memory: nothing survives the process.
+    """
+    
+    # Nothing on disk to point the user at
+    path: Optional[Path] = None
+    
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """Initialize the storage.
+        
+        Args:
+            data: Config to start with, or None to start as if never saved
+        """
+        self.data = copy.deepcopy(data)
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Get a copy of the stored config.
+        
+        Returns:
+            The stored config, or None if nothing has been saved yet
+        """
+        return copy.deepcopy(self.data)
+    
+    def save(self, config: Dict[str, Any]) -> None:
+        """Store a copy of the config.
+        
+        Args:
+            config: The config to store
+        """
+        self.data = copy.deepcopy(config)
+
 
 class ConfigManager:
     """Manages persistent configuration for Kitty Mode.
@@ -36,11 +233,24 @@ class ConfigManager:
     *stares intensely at config file*
     """
     
-    def __init__(self):
-        """Initialize the config manager and load configuration."""
-        self.config_dir = self._get_config_dir()
-        self.config_file = self.config_dir / "config.json"
+    def __init__(self, storage: Optional[Union[JsonFileStorage, DictStorage]] = None):
+        """Initialize the config manager and load configuration.
+        
+        Args:
+            storage: Where the config lives; defaults to config.json in the
+                platform config directory
+        """
+        if storage is None:
+            storage = JsonFileStorage(self._get_config_dir() / "config.json")
+        self.storage = storage
         self.config = self._load_config()
+        
+        # Debounced saving: changes mark the config dirty and a single timer
+        # writes them out once things have settled down
+        self._dirty = False
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        atexit.register(self._flush)
     
     def _get_config_dir(self) -> Path:
         """Get platform-appropriate config directory.
@@ -48,42 +258,70 @@ def _get_config_dir(self) -> Path:
         Returns:
             Path to the config directory
         """
-        if is_windows():
-            # Windows: %APPDATA%\KittyMode
-            base = Path(os.environ.get('APPDATA', Path.home()))
-        elif is_macos():
-            # macOS: ~/Library/Application Support/KittyMode
-            base = Path.home() / "Library" / "Application Support"
-        else:
-            # Linux: ~/.config/KittyMode
-            base = Path.home() / ".config"
-        
-        config_dir = base / "KittyMode"
+        config_dir = _PLATFORM_BASE / "KittyMode"
         config_dir.mkdir(parents=True, exist_ok=True)
         return config_dir
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load config from file or return defaults.
+        """Load config from storage or return defaults.
         
         Returns:
             Configuration dictionary
         """
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
-                    # Merge with defaults to handle new config keys
-                    return {**DEFAULT_CONFIG, **loaded}
-            except (json.JSONDecodeError, IOError) as e:
-                logger.warning(f"Could not load config file: {e}")
-        return DEFAULT_CONFIG.copy()
+        try:
+            loaded = self.storage.load()
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not load config file: {e}")
+            loaded = None
+        if loaded is None:
+            return _default_config()
+        # Merge with defaults to handle new config keys
+        return {**_default_config(), **loaded}
     
     def save(self) -> None:
-        """Save current config to file."""
+        """Save current config to file immediately."""
+        with self._save_lock:
+            self._cancel_save_timer()
+            self._write_file()
+    
+    def close(self) -> None:
+        """Write out any pending changes and drop the exit hook.
+        
+        Changes made after closing are still saved by the debounce timer,
+        but no longer at interpreter exit.
+        """
+        self._flush()
+        # The hook holds a reference, which would keep this manager alive
+        atexit.unregister(self._flush)
+    
+    def _mark_dirty(self) -> None:
+        """Schedule a save once changes stop coming in."""
+        with self._save_lock:
+            self._dirty = True
+            self._cancel_save_timer()
+            self._save_timer = threading.Timer(SAVE_DEBOUNCE_S, self._flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _flush(self) -> None:
+        """Save the config if there are unsaved changes."""
+        with self._save_lock:
+            self._cancel_save_timer()
+            if self._dirty:
+                self._write_file()
+    
+    def _cancel_save_timer(self) -> None:
+        """Cancel the pending save timer. Caller must hold _save_lock."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+    
+    def _write_file(self) -> None:
+        """Write the config to storage. Caller must hold _save_lock."""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
-        except IOError as e:
+            self.storage.save(self.config)
+            self._dirty = False
+        except OSError as e:
             logger.warning(f"Could not save config file: {e}")
     
     def get(self, key: str, default: Any = None) -> Any:
@@ -106,7 +344,7 @@ def set(self, key: str, value: Any) -> None:
             value: Value to set
         """
         self.config[key] = value
-        self.save()
+        self._mark_dirty()
     
     def update(self, updates: Dict[str, Any]) -> None:
         """Update multiple config values and save.
@@ -115,11 +353,11 @@ def update(self, updates: Dict[str, Any]) -> None:
             updates: Dictionary of updates
         """
         self.config.update(updates)
-        self.save()
+        self._mark_dirty()
     
     def reset_to_defaults(self) -> None:
         """Reset config to defaults."""
-        self.config = DEFAULT_CONFIG.copy()
+        self.config = _default_config()
         self.save()
     
     def add_custom_noise(self, noise: str) -> bool:
@@ -133,7 +371,7 @@ def add_custom_noise(self, noise: str) -> bool:
         """
         if noise and noise not in self.config["custom_noises"]:
             self.config["custom_noises"].append(noise)
-            self.save()
+            self._mark_dirty()
             return True
         return False
     
@@ -148,7 +386,7 @@ def remove_custom_noise(self, noise: str) -> bool:
         """
         if noise in self.config["custom_noises"]:
             self.config["custom_noises"].remove(noise)
-            self.save()
+            self._mark_dirty()
             return True
         return False
     
@@ -160,10 +398,10 @@ def get_custom_noises(self) -> List[str]:
         """
         return self.config.get("custom_noises", [])
     
-    def get_config_path(self) -> Path:
+    def get_config_path(self) -> Optional[Path]:
         """Get the path to the config file.
         
         Returns:
-            Path to config.json
+            Path to config.json, or None if the config isn't kept on disk
         """
-        return self.config_file
+        return self.storage.path
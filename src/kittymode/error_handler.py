@@ -6,11 +6,10 @@
 
 import sys
 import traceback
-import tkinter as tk
-from tkinter import messagebox
 from typing import Any, Callable, Optional, TypeVar
 
-from .logger import logger
+from .logger import get_logger
+from .platform_utils import is_macos, is_windows
 
 T = TypeVar('T')
 
@@ -35,21 +34,49 @@ def handle_exception(exc_type, exc_value, exc_tb) -> None:
             return  # Normal exit
         
         error_msg = ''.join(traceback.format_exception(exc_type, exc_value, exc_tb))
-        logger.error(f"Unhandled exception:\n{error_msg}")
+        get_logger().error(f"Unhandled exception:\n{error_msg}")
         
         # Show user-friendly dialog
         try:
-            root = tk.Tk()
-            root.withdraw()
-            messagebox.showerror(
+            ErrorHandler.show_error_dialog(
                 "Kitty Mode Error",
                 f"An unexpected error occurred:\n\n{exc_value}\n\n"
                 "Please check the log file for details."
             )
-            root.destroy()
         except Exception:
             pass
     
+    @staticmethod
+    def show_error_dialog(title: str, message: str) -> None:
+        """Show a modal error dialog using the OS's native dialog if possible.
+        
+        Args:
+            title: Dialog title
+            message: Message to display
+        """
+        if is_windows():
+            import ctypes
+            MB_ICONERROR = 0x10
+            ctypes.windll.user32.MessageBoxW(0, message, title, MB_ICONERROR)
+        elif is_macos():
+            import subprocess
+            # Pass the text as arguments so quotes in it can't break the script
+            subprocess.run([
+                'osascript',
+                '-e', 'on run argv',
+                '-e', 'display dialog (item 2 of argv) with title (item 1 of argv) '
+                      'buttons {"OK"} default button "OK" with icon stop',
+                '-e', 'end run',
+                title, message
+            ], capture_output=True)
+        else:
+            import tkinter as tk
+            from tkinter import messagebox
+            root = tk.Tk()
+            root.withdraw()
+            messagebox.showerror(title, message)
+            root.destroy()
+    
     @staticmethod
     def safe_call(
         func: Callable[..., T],
@@ -71,7 +98,7 @@ def safe_call(
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {e}")
+            get_logger().error(f"Error in {func.__name__}: {e}")
             return default
 
 
@@ -1,4 +1,4 @@
-"""Generate embeddings for cat noises using sentence-transformers.
+"""Generate embeddings for cat noises using the exported ONNX model.
 
 Teaching the machine to understand the subtle art of meowing!
 Transforming cat sounds into vectors... it's AI-ron-ic! 🤖🐱
@@ -6,9 +6,138 @@
 
 import json
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+# Same preference order as similarity_search.MODEL_FILES, so the database
+# is embedded by the same model that embeds queries at runtime
+MODEL_FILES = ("model_opt.onnx", "model_int8.onnx", "model.onnx")
+
+# Texts per session.run call
+BATCH_SIZE = 64
+
+# Same as similarity_search.NOISE_FIELDS: the per-noise string fields stored
+# in noises.npz alongside the texts
+NOISE_FIELDS = ("category", "base_noise", "variation_type")
+
+
+def encode(texts: list[str], model_dir: Path, batch_size: int = BATCH_SIZE) -> np.ndarray:
+    """Embed texts with the ONNX model using batched inference.
+    
+    Args:
+        texts: Texts to embed
+        model_dir: Directory containing the exported model and tokenizer files
+        batch_size: Number of texts per inference call
+    
+    Returns:
+        Mean-pooled embeddings of shape (len(texts), embedding_dim)
+    """
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+    
+    onnx_path = next(
+        (model_dir / name for name in MODEL_FILES if (model_dir / name).exists()),
+        None
+    )
+    if onnx_path is None:
+        raise FileNotFoundError(
+            f"ONNX model not found in {model_dir}. Run 'python scripts/export_onnx.py' first."
+        )
+    
+    print(f"Loading ONNX model: {onnx_path}")
+    tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+    session = ort.InferenceSession(str(onnx_path), providers=['CPUExecutionProvider'])
+    input_names = {i.name for i in session.get_inputs()}
+    
+    pooled_batches = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        inputs = tokenizer(
+            batch,
+            return_tensors="np",
+            padding=True,
+            truncation=True,
+            max_length=512
+        )
+        
+        input_feed = {
+            "input_ids": inputs["input_ids"],
+            "attention_mask": inputs["attention_mask"],
+        }
+        if "token_type_ids" in input_names:
+            input_feed["token_type_ids"] = inputs.get(
+                "token_type_ids",
+                np.zeros_like(inputs["input_ids"])
+            )
+        
+        outputs = session.run(None, input_feed)
+        
+        embeddings = outputs[0]
+        if embeddings.ndim == 2:
+            # Current exports mean-pool inside the graph
+            pooled_batches.append(embeddings)
+        else:
+            # Older exports return the hidden state: mean pooling over
+            # non-padding tokens, without materializing the masked
+            # (batch, seq, dim) product
+            mask = inputs["attention_mask"]
+            pooled_batches.append(
+                np.einsum('bsd,bs->bd', embeddings, mask.astype(embeddings.dtype))
+                / mask.sum(axis=1, keepdims=True).clip(min=1)
+            )
+        
+        print(f"  Encoded {min(start + batch_size, len(texts))}/{len(texts)}")
+    
+    return np.concatenate(pooled_batches).astype(np.float32)
+
+
+def quantize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """Quantize each row to int8, scaled so its largest component maps to 127.
+    
+    Args:
+        embeddings: Float embeddings of shape (n, embedding_dim)
+        
+    Returns:
+        int8 matrix of the same shape, each row pointing the same way as
+        the input row
+    """
+    scales = np.abs(embeddings).max(axis=1, keepdims=True).clip(min=1e-12) / 127
+    return np.round(embeddings / scales).astype(np.int8)
+
+
+def dictionary_encode(values: list[Optional[str]]) -> tuple[np.ndarray, np.ndarray]:
+    """Split a column into its distinct values and one code per row.
+    
+    Args:
+        values: Column values, possibly None
+        
+    Returns:
+        Tuple of (distinct values in first-seen order, int32 codes into
+        them), with code -1 standing for None
+    """
+    vocabulary = list(dict.fromkeys(v for v in values if v is not None))
+    lookup = {v: i for i, v in enumerate(vocabulary)}
+    codes = np.array([lookup.get(v, -1) for v in values], dtype=np.int32)
+    return np.array(vocabulary, dtype=str), codes
+
+
+def save_noise_index(index_path: Path, noises: list[dict]) -> None:
+    """Save the noises positionally: row i of embeddings.npy is noises[i].
+    
+    Texts are a fixed-width unicode array and the other fields are
+    dictionary-encoded, so loading needs neither pickle nor JSON parsing.
+    
+    Args:
+        index_path: Where to write noises.npz
+        noises: Noise dicts in embedding row order
+    """
+    columns = {"texts": np.array([noise["text"] for noise in noises], dtype=str)}
+    for field in NOISE_FIELDS:
+        values, codes = dictionary_encode([noise[field] for noise in noises])
+        columns[f"{field}_values"] = values
+        columns[f"{field}_codes"] = codes
+    np.savez_compressed(index_path, **columns)
 
 
 def main():
@@ -18,10 +147,12 @@ def main():
     *puts on tiny cat-sized lab coat* Science time! 🐱🧪
     """
     # Paths
-    data_dir = Path(__file__).parent.parent.parent / "data"
+    project_root = Path(__file__).parent.parent.parent
+    data_dir = project_root / "data"
+    model_dir = project_root / "models" / "onnx"
     noises_path = data_dir / "cat_noises.json"
     embeddings_path = data_dir / "embeddings.npy"
-    index_path = data_dir / "noise_index.json"
+    index_path = data_dir / "noises.npz"
     
     # Load cat noises
     print(f"Loading noises from: {noises_path}")
@@ -32,33 +163,25 @@ def main():
     texts = [noise["text"] for noise in noises]
     print(f"Loaded {len(texts)} cat noises")
     
-    # Load sentence transformer model
-    print("Loading sentence-transformers model: all-MiniLM-L6-v2")
-    model = SentenceTransformer("all-MiniLM-L6-v2")
-    
     # Generate embeddings
     print("Generating embeddings...")
-    embeddings = model.encode(texts, show_progress_bar=True, convert_to_numpy=True)
+    embeddings = encode(texts, model_dir)
+    
+    # Store as int8 with a symmetric per-row scale: a quarter of the float32
+    # size. The scales themselves aren't saved, since the runtime
+    # re-normalizes every row on load and that cancels them out
+    embeddings = quantize_rows(embeddings)
     
     # Save embeddings
     print(f"Saving embeddings to: {embeddings_path}")
     np.save(embeddings_path, embeddings)
     
-    # Create and save index mapping
-    noise_index = {
-        "index_to_noise": {i: noise for i, noise in enumerate(noises)},
-        "text_to_index": {noise["text"]: i for i, noise in enumerate(noises)},
-        "total_count": len(noises),
-        "embedding_dim": embeddings.shape[1]
-    }
-    
     print(f"Saving noise index to: {index_path}")
-    with open(index_path, "w", encoding="utf-8") as f:
-        json.dump(noise_index, f, indent=2, ensure_ascii=False)
+    save_noise_index(index_path, noises)
     
     print(f"\nDone!")
     print(f"  Embeddings shape: {embeddings.shape}")
-    print(f"  Index entries: {len(noise_index['text_to_index'])}")
+    print(f"  Index entries: {len(texts)}")
 
 
 if __name__ == "__main__":
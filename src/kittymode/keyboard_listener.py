@@ -37,6 +37,8 @@ def __init__(
         """
         self.on_window_complete = on_window_complete_callback
         self._enabled = False
+        # start() was called; the OS hook only runs while also enabled
+        self._running = False
         self._listener: Optional[keyboard.Listener] = None
         
         # Flag to suppress input during our own output (prevents feedback loops)
@@ -51,7 +53,17 @@ def __init__(
         )
     
     def start(self) -> None:
-        """Start listening for keyboard events."""
+        """Start listening for keyboard events.
+        
+        The keyboard hook itself is only installed while capturing is
+        enabled, so keystrokes cost nothing while kitty mode is off.
+        """
+        self._running = True
+        if self._enabled:
+            self._start_listener()
+    
+    def _start_listener(self) -> None:
+        """Install the platform keyboard hook if it isn't already running."""
         if self._listener is not None:
             return  # Already running
         
@@ -106,20 +118,32 @@ def _start_default(self) -> None:
     
     def stop(self) -> None:
         """Stop listening for keyboard events."""
-        if self._listener is not None:
-            self._listener.stop()
-            self._listener = None
+        self._running = False
+        self._stop_listener()
         
         # Cancel any pending capture window
         self._capture_window.cancel()
     
+    def _stop_listener(self) -> None:
+        """Remove the platform keyboard hook if it is running."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+    
     def enable(self) -> None:
         """Enable capturing (kitty mode on)."""
         self._enabled = True
+        if self._running:
+            self._start_listener()
     
     def disable(self) -> None:
-        """Disable capturing (kitty mode off)."""
+        """Disable capturing (kitty mode off).
+        
+        Tears down the keyboard hook so the OS stops calling into Python
+        for every keystroke while kitty mode is off.
+        """
         self._enabled = False
+        self._stop_listener()
         self._capture_window.cancel()
     
     def is_enabled(self) -> bool:
@@ -166,23 +190,16 @@ def _key_to_char(self, key) -> Optional[str]:
         Returns:
             The character string, or None if the key should be ignored
         """
-        try:
-            # Regular character key - pynput handles shift automatically
-            char = key.char
-            if char is not None:
-                return char
-        except AttributeError:
-            # Special key - check if it's one we want to handle
-            pass
-        
-        # Ignore special keys:
+        # Regular character keys have .char (pynput handles shift
+        # automatically). Special keys have no .char or char=None, and are
+        # ignored:
         # - Enter, Tab, Escape
         # - Backspace (cat wouldn't use backspace)
         # - Ctrl, Alt, Cmd/Win
         # - Function keys
         # - Arrow keys
         # - etc.
-        return None
+        return getattr(key, 'char', None)
     
     def _on_capture_complete(self, captured_string: str, char_count: int) -> None:
         """Called when capture window closes with accumulated input.
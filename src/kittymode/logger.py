@@ -4,11 +4,14 @@
 Because even cats need to journal sometimes. 📓🐱
 """
 
+import functools
 import logging
 import os
+import threading
 import time
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 from .platform_utils import is_windows, is_macos
 
@@ -46,12 +49,18 @@ def setup_logging(level: int = logging.INFO) -> logging.Logger:
     ))
     logger.addHandler(file_handler)
     
-    # Rotate old logs (keep last 7 days)
-    _cleanup_old_logs(log_dir, days=7)
+    # Rotate old logs (keep last 7 days) off the startup path
+    threading.Thread(
+        target=_cleanup_old_logs,
+        args=(log_dir, 7),
+        name="LogCleanup",
+        daemon=True
+    ).start()
     
     return logger
 
 
+@functools.lru_cache(maxsize=1)
 def _get_log_dir() -> Path:
     """Get platform-appropriate log directory.
     
@@ -79,13 +88,43 @@ def _cleanup_old_logs(log_dir: Path, days: int = 7) -> None:
     """
     cutoff = time.time() - (days * 86400)
     
-    for log_file in log_dir.glob("kittymode_*.log"):
-        try:
-            if log_file.stat().st_mtime < cutoff:
-                log_file.unlink()
-        except OSError:
-            pass
+    # DirEntry.stat() reuses data from the directory listing where it can
+    try:
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("kittymode_") and entry.name.endswith(".log")):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
 
 
-# Global logger instance - use DEBUG level to capture diagnostic info
-logger = setup_logging(level=logging.DEBUG)
+_logger: Optional[logging.Logger] = None
+
+
+def get_logger() -> logging.Logger:
+    """Get the global logger, setting up logging on first use.
+    
+    Returns:
+        The configured 'kittymode' logger (DEBUG level, to capture
+        diagnostic info)
+    """
+    global _logger
+    if _logger is None:
+        _logger = setup_logging(level=logging.DEBUG)
+    return _logger
+
+
+def __getattr__(name: str):
+    """Create the global `logger` lazily (PEP 562).
+    
+    `from .logger import logger` keeps working, but merely importing this
+    module no longer opens log files or touches the log directory.
+    """
+    if name == "logger":
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -14,6 +14,7 @@
 from .keyboard_listener import KeyboardListener
 from .similarity_search import CatNoiseFinder
 from .noise_selector import NoiseSelector
+from .platform_utils import is_windows
 from .text_output import TextOutput
 from .toggle import KittyModeToggle
 from .tray import KittyModeTray
@@ -41,6 +42,9 @@ def __init__(self):
         # Track last output time to prevent feedback loops
         self._last_output_time: float = 0
         
+        # Set by stop(); run_cli blocks on it instead of polling
+        self._stop_event = threading.Event()
+        
         # Get config values
         typing_delay_ms = self.config_manager.get('typing_delay_ms', 0)
         window_duration_ms = self.config_manager.get('window_duration_ms', 800)
@@ -50,7 +54,11 @@ def __init__(self):
         
         # Initialize components
         logger.info("Loading cat noise database...")
-        self.finder = CatNoiseFinder()
+        self.finder = CatNoiseFinder(
+            intra_op_threads=self.config_manager.get('onnx_intra_op_threads', 0),
+            inter_op_threads=self.config_manager.get('onnx_inter_op_threads', 1),
+            optimization_level=self.config_manager.get('onnx_optimization_level', 'auto')
+        )
         
         # Add custom noises if configured
         custom_noises = self.config_manager.get_custom_noises()
@@ -58,6 +66,10 @@ def __init__(self):
             logger.info(f"Adding {len(custom_noises)} custom noises...")
             self.finder.add_custom_noises(custom_noises)
         
+        # Load and warm the model while the rest starts up, so the first
+        # capture doesn't wait on it
+        self.finder.warm_up_in_thread()
+        
         self.selector = NoiseSelector(self.finder)
         self.output = TextOutput(typing_delay_ms=typing_delay_ms)
         
@@ -114,16 +126,16 @@ def _toggle_from_tray(self) -> None:
             logger.info("Kitty Mode: OFF")
     
     def _show_settings(self) -> None:
-        """Show settings window in separate thread."""
-        def show():
-            self.settings_window = SettingsWindow(
-                config_manager=self.config_manager,
-                on_save=self._apply_settings
-            )
+        """Show settings window, running it in its own thread the first time."""
+        if self.settings_window is not None:
             self.settings_window.show()
+            return
         
-        thread = threading.Thread(target=show, daemon=True)
-        thread.start()
+        self.settings_window = SettingsWindow(
+            config_manager=self.config_manager,
+            on_save=self._apply_settings
+        )
+        self.settings_window.show_in_thread()
     
     def _apply_settings(self, new_config: Dict) -> None:
         """Apply new settings from settings window.
@@ -176,16 +188,18 @@ def _on_capture_complete(self, captured: str, char_count: int) -> None:
         self.listener.suppress()
         
         try:
-            # Select a cat noise based on the input
-            try:
-                noise = self.selector.select_noise(captured)
-            except Exception as e:
-                logger.error(f"Error selecting noise: {e}", exc_info=True)
-                noise = "meow"
+            # Select a cat noise based on the input (never raises)
+            noise = self.selector.select_noise(captured)
             logger.debug(f"Selected noise: '{noise}'")
             
-            # Delete the captured characters and type the cat noise
-            self.output.type_with_clear(noise, char_count, press_enter=self.press_enter_after)
+            # Delete the captured characters and type the cat noise. This runs
+            # on the capture scheduler's thread, so log output errors here
+            # rather than let them reach it
+            try:
+                self.output.type_with_clear(noise, char_count, press_enter=self.press_enter_after)
+            except Exception as e:
+                logger.error(f"Error typing cat noise: {e}", exc_info=True)
+                return
             
             # Record the time of this output
             self._last_output_time = time.time()
@@ -230,19 +244,23 @@ def run_cli(self) -> None:
         self.toggle.start()
         self.listener.start()
         
-        # Keep running until interrupted
+        # Keep running until interrupted. Windows can't deliver Ctrl+C to an
+        # untimed wait, so wake up once a second there
+        timeout = 1.0 if is_windows() else None
         try:
-            while True:
-                time.sleep(0.1)
+            while not self._stop_event.wait(timeout):
+                pass
         except KeyboardInterrupt:
             logger.info("Shutting down...")
             self.stop()
     
     def stop(self) -> None:
         """Stop Kitty Mode and clean up."""
+        self._stop_event.set()
         self.toggle.stop()
         self.listener.stop()
         self.tray.stop()
+        self.config_manager.close()
         logger.info("Kitty Mode stopped.")
 
 
@@ -4,11 +4,17 @@
 soft 'mew' or an enthusiastic 'MRROOOWW', we've got you covered.
 """
 
+import logging
 import random
-from typing import Optional
+from itertools import accumulate
+from typing import Iterator, Optional
+
+import numpy as np
 
 from .similarity_search import CatNoiseFinder
 
+logger = logging.getLogger('kittymode')
+
 
 class NoiseSelector:
     """Select cat noises based on input with intelligent weighting.
@@ -19,7 +25,16 @@ class NoiseSelector:
     
     # Short noises for very brief input - the quick chirps and bleps!
     # These are the 'excuse me, human' sounds. Mrrp!
-    SHORT_NOISE_TEXTS = {"mew", "nya", "brrt", "mao", "blep", "mrrp", "brrp", "prrrp"}
+    SHORT_NOISE_TEXTS = frozenset({"mew", "nya", "brrt", "mao", "blep", "mrrp", "brrp", "prrrp"})
+    # The same noises in a fixed order, for sampling without a list per call
+    _SHORT_NOISE_TUPLE = tuple(SHORT_NOISE_TEXTS)
+    
+    # Separators for compound noises; a plain space is twice as likely
+    COMPOUND_SEPARATORS = (" ", " *purrs* ", "! ", "~ ")
+    COMPOUND_SEPARATOR_WEIGHTS = (2, 1, 1, 1)
+    
+    # Uniform floats drawn per refill of the random buffer
+    RANDOM_BUFFER_SIZE = 1024
     
     def __init__(self, finder: CatNoiseFinder):
         """Initialize selector with a CatNoiseFinder.
@@ -28,23 +43,44 @@ def __init__(self, finder: CatNoiseFinder):
             finder: CatNoiseFinder instance for similarity search
         """
         self.finder = finder
-        self._short_noises: Optional[list[dict]] = None
-        self._base_noises: Optional[list[dict]] = None
+        # Only the texts are cached: the hot path never needs the rest
+        self._short_choices: Optional[tuple[str, ...]] = None
+        self._base_texts: Optional[tuple[str, ...]] = None
+        # Uniform floats drawn in bulk, consumed a few per selection
+        self._rng = np.random.default_rng()
+        self._randoms: Iterator[float] = iter(())
+    
+    def _next_random(self) -> float:
+        """Get the next uniform float in [0, 1), refilling the buffer as needed."""
+        value = next(self._randoms, None)
+        if value is None:
+            self._randoms = iter(self._rng.random(self.RANDOM_BUFFER_SIZE).tolist())
+            value = next(self._randoms)
+        return value
     
     def _ensure_noises_cached(self) -> None:
-        """Cache commonly used noise lists."""
-        if self._short_noises is None:
-            self._short_noises = self.finder.get_short_noises(max_length=5)
-        if self._base_noises is None:
-            self._base_noises = self.finder.get_noise_by_category("base")
+        """Cache commonly used noise texts."""
+        if self._short_choices is None:
+            short_texts = tuple(n["text"] for n in self.finder.get_short_noises(max_length=5))
+            # Prefer the canonical short noises; filtered once, not per keypress
+            self._short_choices = (
+                tuple(t for t in short_texts if t in self.SHORT_NOISE_TEXTS)
+                or short_texts
+                or self._SHORT_NOISE_TUPLE
+            )
+        if self._base_texts is None:
+            self._base_texts = tuple(n["text"] for n in self.finder.get_noise_by_category("base"))
     
     def select_noise(self, input_text: str) -> str:
         """Select a cat noise based on input with weighted randomness.
         
         Selection logic:
-        - Empty input → random base noise
-        - Very short (1-2 chars) → short noises (mew, nya, brrt)
-        - Short (3-5 chars) → base noises or short variations
+        - Empty or whitespace-only input → random base noise
+        - No letters at all (digits, punctuation) → random short noise for
+          up to 5 chars, random base noise beyond that; nothing to search on
+        - Very short (1-3 chars) → short noises (mew, nya, brrt)
+        - Short (4-5 chars) → similar short noises, or a short noise
+          directly when nothing short resembles the input
         - Medium (6-14 chars) → similar noises with weighting
         - Long (15+ chars) → 30% chance of compound/multiple noises
         
@@ -52,39 +88,86 @@ def select_noise(self, input_text: str) -> str:
             input_text: The captured keyboard input
             
         Returns:
-            Selected cat noise string
+            Selected cat noise string. Never raises: if the similarity search
+            fails, a random base noise (or "meow") is returned instead.
+        """
+        return self.select_noises_batch(input_text, 1)[0]
+    
+    def select_noises_batch(self, input_text: str, n: int) -> list[str]:
+        """Select several cat noises for the same input.
+        
+        Each pick is made independently by the rules of select_noise, but the
+        similarity search runs at most once for all of them.
+        
+        Args:
+            input_text: The captured keyboard input
+            n: Number of noises to select
+            
+        Returns:
+            List of n selected cat noise strings. Never raises, like
+            select_noise.
+        """
+        try:
+            return self._select_noises(input_text, n)
+        except Exception as e:
+            logger.error(f"Error selecting noise: {e}", exc_info=True)
+            return [self._random_base_noise() for _ in range(n)]
+    
+    def _select_noises(self, input_text: str, n: int) -> list[str]:
+        """Select n cat noises; see select_noise for the rules.
+        
+        Args:
+            input_text: The captured keyboard input
+            n: Number of noises to select
+            
+        Returns:
+            List of selected cat noise strings
         """
         self._ensure_noises_cached()
         
         input_length = len(input_text)
         
-        # Empty input → random base noise
-        if input_length == 0:
-            return self._random_base_noise()
+        # Empty or whitespace-only input → random base noise
+        if input_length == 0 or input_text.isspace():
+            return [self._random_base_noise() for _ in range(n)]
+        
+        # No letters → nothing for the model to go on, so don't ask it
+        if not any(map(str.isalpha, input_text)):
+            if input_length <= 5:
+                return [self._select_short_noise() for _ in range(n)]
+            return [self._random_base_noise() for _ in range(n)]
         
-        # Very short input (1-2 chars) → short noise
-        if input_length <= 2:
-            return self._select_short_noise()
+        # Very short input (1-3 chars) → short noise, no search needed
+        if input_length <= 3:
+            return [self._select_short_noise() for _ in range(n)]
+        
+        # Short input with no plausible short match → skip the search too
+        if input_length <= 5 and not self.finder.has_short_match(input_text):
+            return [self._select_short_noise() for _ in range(n)]
         
         # Get similar noises
         candidates = self.finder.find_similar(input_text, top_k=10)
         
         if not candidates:
-            return self._random_base_noise()
+            return [self._random_base_noise() for _ in range(n)]
         
-        # Short input (3-5 chars) → prefer shorter noises
+        # Short input (4-5 chars) → prefer shorter noises
         if input_length <= 5:
             # Filter to shorter noises, but keep all if none match
             short_candidates = [c for c in candidates if len(c["text"]) <= 6]
             if short_candidates:
                 candidates = short_candidates
         
-        # Long input (15+ chars) → chance of compound noise
-        if input_length >= 15 and random.random() < 0.3:
-            return self._select_compound_noise(candidates)
+        # Long input (15+ chars) → chance of compound noise each time
+        may_compound = input_length >= 15
         
         # Standard weighted selection
-        return self._weighted_random_choice(candidates)["text"]
+        return [
+            self._select_compound_noise(candidates)
+            if may_compound and self._next_random() < 0.3
+            else self._weighted_random_choice(candidates)["text"]
+            for _ in range(n)
+        ]
     
     def _weighted_random_choice(self, candidates: list[dict]) -> dict:
         """Select from candidates with probability weighted by similarity score.
@@ -93,7 +176,8 @@ def _weighted_random_choice(self, candidates: list[dict]) -> dict:
         80% chance pick from top 3, 20% chance pick from rest.
         
         Args:
-            candidates: List of candidate dicts with 'score' key
+            candidates: List of candidate dicts with 'weight' key (the
+                squared similarity score, as returned by find_similar)
             
         Returns:
             Selected candidate dict
@@ -106,31 +190,37 @@ def _weighted_random_choice(self, candidates: list[dict]) -> dict:
         
         # 80% chance: select from top 3
         # 20% chance: select from remaining
-        if len(candidates) > 3 and random.random() < 0.2:
+        if len(candidates) > 3 and self._next_random() < 0.2:
             pool = candidates[3:]
         else:
             pool = candidates[:min(3, len(candidates))]
         
-        # Weight by score squared (favor higher scores)
-        weights = [c["score"] ** 2 for c in pool]
-        total_weight = sum(weights)
+        n = len(pool)
+        if n == 1:
+            return pool[0]
         
-        if total_weight == 0:
-            return random.choice(pool)
+        # Top-3 pools are the common case: a couple of comparisons will do
+        if n <= 3:
+            w0 = pool[0]["weight"]
+            w1 = pool[1]["weight"]
+            w2 = pool[2]["weight"] if n == 3 else 0.0
+            total_weight = w0 + w1 + w2
+            if total_weight == 0:
+                return random.choice(pool)
+            r = self._next_random() * total_weight
+            if r < w0:
+                return pool[0]
+            if n == 2 or r < w0 + w1:
+                return pool[1]
+            return pool[2]
         
-        # Normalize weights to probabilities
-        probabilities = [w / total_weight for w in weights]
+        # Cumulative weights (squared scores favor higher scores)
+        cdf = list(accumulate(c["weight"] for c in pool))
         
-        # Weighted random selection
-        r = random.random()
-        cumulative = 0
-        for candidate, prob in zip(pool, probabilities):
-            cumulative += prob
-            if r <= cumulative:
-                return candidate
+        if cdf[-1] == 0:
+            return random.choice(pool)
         
-        # Fallback (should not reach here)
-        return pool[-1]
+        return random.choices(pool, cum_weights=cdf)[0]
     
     def _select_short_noise(self) -> str:
         """Select a random short noise.
@@ -138,14 +228,10 @@ def _select_short_noise(self) -> str:
         Returns:
             A short cat noise string
         """
-        if self._short_noises:
-            # Prefer the canonical short noises
-            canonical = [n for n in self._short_noises if n["text"] in self.SHORT_NOISE_TEXTS]
-            if canonical:
-                return random.choice(canonical)["text"]
-            return random.choice(self._short_noises)["text"]
-        
-        return random.choice(list(self.SHORT_NOISE_TEXTS))
+        if self._short_choices:
+            return random.choice(self._short_choices)
+        
+        return random.choice(self._SHORT_NOISE_TUPLE)
     
     def _random_base_noise(self) -> str:
         """Select a random base noise.
@@ -153,8 +239,8 @@ def _random_base_noise(self) -> str:
         Returns:
             A base cat noise string
         """
-        if self._base_noises:
-            return random.choice(self._base_noises)["text"]
+        if self._base_texts:
+            return random.choice(self._base_texts)
         return "meow"  # Ultimate fallback
     
     def _select_compound_noise(self, candidates: list[dict]) -> str:
@@ -169,17 +255,14 @@ def _select_compound_noise(self, candidates: list[dict]) -> str:
         if len(candidates) < 2:
             return candidates[0]["text"] if candidates else self._random_base_noise()
         
-        # Pick two different noises
-        first = self._weighted_random_choice(candidates)
-        remaining = [c for c in candidates if c["text"] != first["text"]]
-        
-        if remaining:
-            second = self._weighted_random_choice(remaining)
-        else:
-            second = random.choice(candidates)
+        # Pick two different noises, pulling each text out once
+        pick = self._weighted_random_choice
+        first_text = pick(candidates)["text"]
+        remaining = [c for c in candidates if c["text"] != first_text]
+        second_text = (pick(remaining) if remaining else random.choice(candidates))["text"]
         
-        # Join with a random separator
-        separators = [" ", " ", " *purrs* ", "! ", "~ "]
-        separator = random.choice(separators)
+        separator = random.choices(
+            self.COMPOUND_SEPARATORS, self.COMPOUND_SEPARATOR_WEIGHTS
+        )[0]
         
-        return first["text"] + separator + second["text"]
+        return first_text + separator + second_text
@@ -4,16 +4,41 @@
 knock things off ANY desk! Windows, Mac, Linux... all get meows! 🐱💻
 """
 
+import functools
 import platform
 import subprocess
 import sys
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
+# Permission results are constants, so share read-only instances
+_OK_RESULT: Mapping[str, any] = MappingProxyType(
+    {"has_permission": True, "message": "OK", "instructions": ""}
+)
 
+_MACOS_INSTRUCTIONS = """To enable Kitty Mode on macOS:
+
+1. Open System Preferences → Security & Privacy → Privacy
+2. Select "Accessibility" from the left sidebar
+3. Click the lock icon to make changes
+4. Click "+" and add this application (or Terminal/Python)
+5. Restart Kitty Mode
+
+Without this permission, keyboard capture will not work."""
+
+_MACOS_DENIED: Mapping[str, any] = MappingProxyType({
+    "has_permission": False,
+    "message": "Accessibility permission required",
+    "instructions": _MACOS_INSTRUCTIONS
+})
+
+
+@functools.lru_cache(maxsize=1)
 def get_platform() -> str:
     """Return the current platform identifier.
     
     Sniffing out what kind of computer we're lounging on today... *sniff sniff*
+    The answer can't change while we run, so we only sniff once.
     
     Returns:
         'windows', 'macos', or 'linux'
@@ -27,6 +52,7 @@ def get_platform() -> str:
         return 'linux'
 
 
+@functools.lru_cache(maxsize=1)
 def is_windows() -> bool:
     """Check if running on Windows.
     
@@ -36,6 +62,7 @@ def is_windows() -> bool:
     return get_platform() == 'windows'
 
 
+@functools.lru_cache(maxsize=1)
 def is_macos() -> bool:
     """Check if running on macOS.
     
@@ -45,11 +72,11 @@ def is_macos() -> bool:
     return get_platform() == 'macos'
 
 
-def check_permissions() -> Dict[str, any]:
+def check_permissions() -> Mapping[str, any]:
     """Check if app has required permissions.
     
     Returns:
-        Dict with keys:
+        Read-only mapping with keys:
             - has_permission: bool
             - message: str
             - instructions: str
@@ -58,71 +85,93 @@ def check_permissions() -> Dict[str, any]:
         return _check_macos_accessibility()
     elif is_windows():
         return _check_windows_permissions()
-    return {"has_permission": True, "message": "OK", "instructions": ""}
+    return _OK_RESULT
 
 
-def _check_macos_accessibility() -> Dict[str, any]:
-    """Check macOS Accessibility permissions.
+# Framework exporting AXIsProcessTrusted
+_APPLICATION_SERVICES = '/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices'
+
+
+def _ax_is_process_trusted() -> Optional[bool]:
+    """Ask macOS directly whether we have Accessibility access.
     
     Returns:
-        Permission status dict
+        The AXIsProcessTrusted result, or None if the framework can't be loaded
     """
     try:
-        # Try to use AppleScript to check System Events access
-        # This is a simplified check - real check would use pyobjc
-        result = subprocess.run(
-            ['osascript', '-e', 
-             'tell application "System Events" to get properties'],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return {"has_permission": True, "message": "OK", "instructions": ""}
-    except FileNotFoundError:
-        # osascript not found - not on macOS or path issue
-        pass
-    except subprocess.TimeoutExpired:
-        pass
-    except Exception:
-        pass
-    
-    return {
-        "has_permission": False,
-        "message": "Accessibility permission required",
-        "instructions": """To enable Kitty Mode on macOS:
+        import ctypes
+        app_services = ctypes.cdll.LoadLibrary(_APPLICATION_SERVICES)
+        ax_is_process_trusted = app_services.AXIsProcessTrusted
+        ax_is_process_trusted.argtypes = []
+        ax_is_process_trusted.restype = ctypes.c_bool
+        return bool(ax_is_process_trusted())
+    except (OSError, AttributeError):
+        return None
 
-1. Open System Preferences → Security & Privacy → Privacy
-2. Select "Accessibility" from the left sidebar
-3. Click the lock icon to make changes
-4. Click "+" and add this application (or Terminal/Python)
-5. Restart Kitty Mode
 
-Without this permission, keyboard capture will not work."""
-    }
+def _check_macos_accessibility() -> Mapping[str, any]:
+    """Check macOS Accessibility permissions.
+    
+    Returns:
+        Permission status dict
+    """
+    trusted = _ax_is_process_trusted()
+    if trusted:
+        return _OK_RESULT
+    
+    if trusted is None:
+        try:
+            # Framework unavailable: fall back to probing System Events
+            # Only the exit status matters, so skip the output pipes
+            returncode = subprocess.call(
+                ['osascript', '-e', 
+                 'tell application "System Events" to get properties'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=5
+            )
+            if returncode == 0:
+                return _OK_RESULT
+        except FileNotFoundError:
+            # osascript not found - not on macOS or path issue
+            pass
+        except subprocess.TimeoutExpired:
+            pass
+        except Exception:
+            pass
+    
+    return _MACOS_DENIED
 
 
-def _check_windows_permissions() -> Dict[str, any]:
+@functools.lru_cache(maxsize=1)
+def _check_windows_permissions() -> Mapping[str, any]:
     """Check Windows permissions.
     
     Windows usually doesn't need special permissions for keyboard hooks,
-    but some antivirus software may flag them.
+    but some antivirus software may flag them. The admin status can't
+    change while we run, so the result is cached.
     
     Returns:
         Permission status dict
     """
     try:
         import ctypes
-        is_admin = ctypes.windll.shell32.IsUserAnAdmin()
-        return {
+        is_user_an_admin = ctypes.windll.shell32.IsUserAnAdmin
+        is_user_an_admin.argtypes = []
+        is_user_an_admin.restype = ctypes.c_int
+        is_admin = is_user_an_admin()
+        if not is_admin:
+            return _OK_RESULT
+        return MappingProxyType({
             "has_permission": True,
-            "message": "OK" + (" (Administrator)" if is_admin else ""),
+            "message": "OK (Administrator)",
             "instructions": ""
-        }
+        })
     except AttributeError:
         # Not on Windows or windll not available
-        return {"has_permission": True, "message": "OK", "instructions": ""}
+        return _OK_RESULT
     except Exception:
-        return {"has_permission": True, "message": "OK", "instructions": ""}
+        return _OK_RESULT
 
 
 def request_permissions() -> None:
@@ -18,6 +18,9 @@ class SettingsWindow:
     
     Every kitty needs their own purrsonalized settings! Adjust timing,
     add custom meows, and make Kitty Mode truly yours. Nya~
+    
+    The window is built once and hidden on close, like a cat that never
+    really leaves the room - reopening just brings it back.
     """
     
     def __init__(
@@ -35,24 +38,45 @@ def __init__(
         self.on_save = on_save
         self.window: Optional[tk.Tk] = None
         self._is_showing = False
+        # Claimed by the first show, before any thread starts building
+        self._started = False
+        self._started_lock = threading.Lock()
+        # Set once the Tk main loop runs and can take calls from other threads
+        self._ready = threading.Event()
     
     def show(self) -> None:
-        """Show the settings window."""
-        if self._is_showing:
-            if self.window:
-                self.window.lift()
-            return
+        """Show the settings window.
         
+        The first call builds the window and runs the Tk main loop, so it
+        blocks. Later calls, from any thread, bring the hidden window back.
+        """
+        if self._claim_first_show():
+            self._run()
+        else:
+            self._request_reopen()
+    
+    def _claim_first_show(self) -> bool:
+        """Check whether this is the first show, marking it taken if so."""
+        with self._started_lock:
+            first = not self._started
+            self._started = True
+        return first
+    
+    def _request_reopen(self) -> None:
+        """Ask the Tk thread to bring the window back, once it's running."""
+        self._ready.wait()
+        self.window.after_idle(self._reopen)
+    
+    def _run(self) -> None:
+        """Build the window and run the Tk main loop until the app exits."""
         self._is_showing = True
         
         self.window = tk.Tk()
         self.window.title("Kitty Mode Settings")
         self.window.geometry("420x480")
         self.window.resizable(False, False)
-        
-        # Try to bring window to front
-        self.window.attributes('-topmost', True)
-        self.window.after(100, lambda: self.window.attributes('-topmost', False))
+        # Build hidden so the widget tree is laid out once, not shown piecemeal
+        self.window.withdraw()
         
         # Create notebook for tabs
         notebook = ttk.Notebook(self.window)
@@ -81,8 +105,46 @@ def show(self) -> None:
         ttk.Button(btn_frame, text="Reset to Defaults", command=self._reset).pack(side='left', padx=5)
         
         self.window.protocol("WM_DELETE_WINDOW", self._close)
+        
+        # One geometry pass for everything, then map the finished window
+        self.window.update_idletasks()
+        self.window.deiconify()
+        self._bring_to_front()
+        
+        self.window.after_idle(self._ready.set)
         self.window.mainloop()
     
+    def _reopen(self) -> None:
+        """Show the hidden window again with freshly loaded settings."""
+        if not self._is_showing:
+            self._is_showing = True
+            self._load_settings()
+            self.window.deiconify()
+        self._bring_to_front()
+    
+    def _bring_to_front(self) -> None:
+        """Raise the window above others without pinning it there."""
+        self.window.lift()
+        self.window.attributes('-topmost', True)
+        self.window.after(100, lambda: self.window.attributes('-topmost', False))
+    
+    def _load_settings(self) -> None:
+        """Refresh every control from the current config."""
+        self.duration_var.set(self.config.get('window_duration_ms', 800))
+        self.delay_var.set(self.config.get('typing_delay_ms', 0))
+        self.start_enabled_var.set(self.config.get('enabled_by_default', False))
+        self.noise_entry.delete(0, tk.END)
+        self.noise_listbox.delete(0, tk.END)
+        self._load_custom_noises()
+    
+    def _load_custom_noises(self) -> None:
+        """Fill the listbox with the configured custom noises."""
+        # One Tk call for all of them, mirrored in a set for duplicate checks
+        custom_noises = self.config.get_custom_noises()
+        self._noise_set: set[str] = set(custom_noises)
+        if custom_noises:
+            self.noise_listbox.insert(tk.END, *custom_noises)
+    
     def _create_general_tab(self, parent: ttk.Frame) -> None:
         """Create the General settings tab.
         
@@ -102,9 +164,7 @@ def _create_general_tab(self, parent: ttk.Frame) -> None:
         duration_scale.pack(side='left')
         self.duration_label = ttk.Label(duration_frame, text=f"{self.duration_var.get()} ms", width=10)
         self.duration_label.pack(side='left', padx=10)
-        duration_scale.config(command=lambda v: self.duration_label.config(
-            text=f"{int(float(v))} ms"
-        ))
+        self.duration_var.trace_add('write', self._update_duration_label)
         
         ttk.Label(parent, text="How long to wait for more keypresses before converting",
                   foreground='gray').pack(anchor='w')
@@ -122,9 +182,7 @@ def _create_general_tab(self, parent: ttk.Frame) -> None:
         delay_scale.pack(side='left')
         self.delay_label = ttk.Label(delay_frame, text=f"{self.delay_var.get()} ms", width=10)
         self.delay_label.pack(side='left', padx=10)
-        delay_scale.config(command=lambda v: self.delay_label.config(
-            text=f"{int(float(v))} ms"
-        ))
+        self.delay_var.trace_add('write', self._update_delay_label)
         
         ttk.Label(parent, text="Delay between each character when typing (0 = instant)",
                   foreground='gray').pack(anchor='w')
@@ -142,6 +200,14 @@ def _create_general_tab(self, parent: ttk.Frame) -> None:
         hotkey_frame.pack(fill='x', pady=(5, 0))
         ttk.Label(hotkey_frame, text="Ctrl + Shift + K", font=('Courier', 10)).pack(anchor='w')
     
+    def _update_duration_label(self, *_) -> None:
+        """Show the current window duration next to its slider."""
+        self.duration_label.config(text=f"{self.duration_var.get()} ms")
+    
+    def _update_delay_label(self, *_) -> None:
+        """Show the current typing delay next to its slider."""
+        self.delay_label.config(text=f"{self.delay_var.get()} ms")
+    
     def _create_noises_tab(self, parent: ttk.Frame) -> None:
         """Create the Custom Noises tab.
         
@@ -174,8 +240,7 @@ def _create_noises_tab(self, parent: ttk.Frame) -> None:
         self.noise_listbox.config(yscrollcommand=scrollbar.set)
         
         # Load existing custom noises
-        for noise in self.config.get_custom_noises():
-            self.noise_listbox.insert(tk.END, noise)
+        self._load_custom_noises()
         
         # Remove button
         ttk.Button(parent, text="Remove Selected", command=self._remove_noise).pack(anchor='w', pady=10)
@@ -199,7 +264,7 @@ def _create_about_tab(self, parent: ttk.Frame) -> None:
         ttk.Label(parent, text="• Your typing is replaced with meows!").pack(anchor='w')
         
         ttk.Label(parent, text="").pack(pady=10)
-        config_path = str(self.config.get_config_path())
+        config_path = self.config.get_config_path() or "(in memory, not saved)"
         ttk.Label(parent, text=f"Config: {config_path}", foreground='gray', 
                   wraplength=350).pack(anchor='w')
     
@@ -208,8 +273,8 @@ def _add_noise(self) -> None:
         noise = self.noise_entry.get().strip()
         if noise:
             # Check if already exists
-            existing = list(self.noise_listbox.get(0, tk.END))
-            if noise not in existing:
+            if noise not in self._noise_set:
+                self._noise_set.add(noise)
                 self.noise_listbox.insert(tk.END, noise)
             self.noise_entry.delete(0, tk.END)
     
@@ -217,6 +282,7 @@ def _remove_noise(self) -> None:
         """Remove the selected noise from the listbox."""
         selection = self.noise_listbox.curselection()
         if selection:
+            self._noise_set.discard(self.noise_listbox.get(selection[0]))
             self.noise_listbox.delete(selection[0])
     
     def _save(self) -> None:
@@ -240,22 +306,27 @@ def _reset(self) -> None:
         """Reset settings to defaults after confirmation."""
         if messagebox.askyesno("Reset Settings", "Reset all settings to defaults?"):
             self.config.reset_to_defaults()
-            messagebox.showinfo("Reset", "Settings have been reset. Please reopen the settings window.")
-            self._close()
+            self._load_settings()
     
     def _close(self) -> None:
-        """Close the settings window."""
+        """Hide the settings window, keeping it around for next time."""
         self._is_showing = False
         if self.window:
-            self.window.destroy()
-            self.window = None
+            self.window.withdraw()
     
-    def show_in_thread(self) -> threading.Thread:
+    def show_in_thread(self) -> Optional[threading.Thread]:
         """Show the settings window in a separate thread.
         
         Returns:
-            The thread running the window
+            The thread running the window, or None if it was already running
+            and has just been brought back
         """
-        thread = threading.Thread(target=self.show, daemon=True)
+        # Claimed here rather than in the thread, so a show() that comes in
+        # before the thread gets going reopens this window instead of
+        # building a second one
+        if not self._claim_first_show():
+            self._request_reopen()
+            return None
+        thread = threading.Thread(target=self._run, daemon=True)
         thread.start()
         return thread
@@ -6,16 +6,239 @@
 It's like a cat's sixth sense for knowing exactly what sound to make!
 """
 
+import bisect
+import functools
 import json
 import logging
+import os
+import platform
 import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# ONNX model files in order of preference, all produced by
+# scripts/export_onnx.py: the pre-optimized INT8 graph, the plain INT8 model,
+# and model.onnx as the FP32 fallback.
+MODEL_FILES = ("model_opt.onnx", "model_int8.onnx", "model.onnx")
+
+# Saved by export_onnx.py with the extended (hardware-independent) graph
+# optimizations already applied; only "all" has anything left to do on it
+OPTIMIZED_MODEL_FILE = "model_opt.onnx"
+
+# Upper bound on automatically chosen intra-op threads; a single short query
+# gains nothing from more and pays for the extra synchronization
+MAX_AUTO_INTRA_OP_THREADS = 4
+
+# Accepted values of the onnx_optimization_level setting; "auto" picks
+# "extended" on Intel CPUs, where "all" adds layout transforms that can be
+# slower, and "all" elsewhere
+OPTIMIZATION_LEVELS = ("auto", "basic", "extended", "all")
+
+# Query embeddings kept by CatNoiseFinder, least recently used dropped
+# first; repeated inputs skip the model
+EMBED_CACHE_SIZE = 1024
+
+# Shortest input whose one-edit neighbours may reuse the previous results;
+# shorter inputs change meaning with a single keystroke
+MIN_NEAR_REPEAT_LENGTH = 6
+
+# Longest noise has_short_match considers short; matches the selector's
+# short-candidate cutoff
+SHORT_MATCH_MAX_LENGTH = 6
+
+# Per-noise string fields stored dictionary-encoded in noises.npz
+NOISE_FIELDS = ("category", "base_noise", "variation_type")
+
+# Throwaway queries run by warm_up: a short one and a longer one, so kernels
+# for both typical input sizes are set up before the first keystroke
+WARMUP_TEXTS = ("meow", "mrrrow purr purr nyaa mew mew meow")
+
+# Tokens per text the model sees; longer inputs are truncated
+MAX_SEQ_LENGTH = 512
+
+
+def _resolve_intra_op_threads(requested: int) -> int:
+    """Get the intra-op thread count to use for ONNX Runtime.
+    
+    Args:
+        requested: Configured thread count, or 0 to choose automatically
+        
+    Returns:
+        The requested count, or min(4, half the logical CPUs) when 0
+    """
+    if requested > 0:
+        return requested
+    return max(1, min(MAX_AUTO_INTRA_OP_THREADS, (os.cpu_count() or 2) // 2))
+
+
+@functools.lru_cache(maxsize=1)
+def _is_intel_cpu() -> bool:
+    """Check whether we're running on an Intel CPU."""
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/cpuinfo', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('vendor_id'):
+                        return 'GenuineIntel' in line
+        except OSError:
+            pass
+        return False
+    if sys.platform == 'darwin':
+        # Every x86 Mac has an Intel CPU
+        return platform.machine() == 'x86_64'
+    # Windows reports e.g. "Intel64 Family 6 Model 140 Stepping 1, GenuineIntel"
+    return 'GenuineIntel' in platform.processor()
+
+
+def _resolve_optimization_level(requested: str) -> str:
+    """Get the ONNX Runtime graph optimization level to use.
+    
+    Args:
+        requested: One of OPTIMIZATION_LEVELS
+        
+    Returns:
+        "basic", "extended" or "all"; "auto" and unknown values resolve to
+        "extended" on Intel CPUs and "all" elsewhere
+    """
+    if requested in OPTIMIZATION_LEVELS[1:]:
+        return requested
+    if requested != "auto":
+        logger.warning(f"Unknown ONNX optimization level {requested!r}, using auto")
+    return "extended" if _is_intel_cpu() else "all"
+
+
+def _session_optimization_level(model_file: str, requested: str) -> Optional[str]:
+    """Get the graph optimization level to load a model file with.
+    
+    Args:
+        model_file: File name of the model being loaded
+        requested: One of OPTIMIZATION_LEVELS
+        
+    Returns:
+        "basic", "extended" or "all", or None to load with optimizations
+        disabled because the export already applied them
+    """
+    level = _resolve_optimization_level(requested)
+    if model_file == OPTIMIZED_MODEL_FILE and level != "all":
+        return None
+    return level
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Check whether two strings differ by at most one insert, delete or substitution."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    # Skip the common prefix, then the rest must match after one edit
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+class _SubstringIndex:
+    """Finds the noises that contain a query or are contained in it.
+    
+    The lowercased texts are joined into one string, so str.find scans them
+    all in C instead of testing each text from Python. Texts inside the
+    query are dict lookups of the query's slices, at each length some text
+    actually has.
+    """
+    
+    def __init__(self, texts: Iterable[str]):
+        """Index the texts.
+        
+        Args:
+            texts: Noise texts in row order
+        """
+        self._texts = [text.lower() for text in texts]
+        # NUL can't be typed, so it never joins two texts into a false match
+        self._joined = "\0".join(self._texts)
+        self._starts = []
+        offset = 0
+        for text in self._texts:
+            self._starts.append(offset)
+            offset += len(text) + 1
+        self._rows_by_text: dict[str, list[int]] = {}
+        for i, text in enumerate(self._texts):
+            self._rows_by_text.setdefault(text, []).append(i)
+        self._lengths = sorted({len(text) for text in self._texts})
+        # A find hop costs about as much as testing a dozen texts directly,
+        # so past this many containing rows a plain scan is cheaper
+        self._max_find_hits = max(1, len(self._texts) // 16)
+    
+    def hits(self, query: str) -> list[int]:
+        """Get the rows whose text contains the query or is contained in it.
+        
+        Args:
+            query: Lowercased input text
+            
+        Returns:
+            Matching row indices, ascending
+        """
+        rows = self._containing(query)
+        
+        rows_by_text = self._rows_by_text
+        for length in self._lengths:
+            if length > len(query):
+                break
+            for start in range(len(query) - length + 1):
+                found = rows_by_text.get(query[start:start + length])
+                if found:
+                    rows.update(found)
+        
+        return sorted(rows)
+    
+    def _containing(self, query: str) -> set[int]:
+        """Get the rows whose text contains the query."""
+        if "\0" in query or self._joined.count(query) > self._max_find_hits:
+            # Many texts match (str.count is a fast C scan), so test each directly
+            return {i for i, text in enumerate(self._texts) if query in text}
+        
+        rows = set()
+        find, starts = self._joined.find, self._starts
+        pos = find(query)
+        while pos != -1:
+            row = bisect.bisect_right(starts, pos) - 1
+            rows.add(row)
+            if row + 1 == len(starts):
+                break
+            # Resume at the next text; more hits in this one add nothing
+            pos = find(query, starts[row + 1])
+        return rows
+
+
+def _top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Get the indices of the k largest values, largest first.
+    
+    Partitions out the k best and sorts only those. For the noise database
+    this beats heapq.nlargest by 20x or more, since the heap walks every
+    element in Python.
+    
+    Args:
+        values: 1-D array to select from
+        k: Number of indices to return
+        
+    Returns:
+        Up to k indices into values, in descending order of value
+    """
+    if k <= 0:
+        # Slicing [-0:] below would keep everything
+        return np.empty(0, dtype=np.intp)
+    if k >= len(values):
+        return np.argsort(values)[::-1]
+    top = np.argpartition(values, -k)[-k:]
+    return top[np.argsort(values[top])[::-1]]
+
 
 def _get_base_path() -> Path:
     """Get the base path, handling both normal and PyInstaller execution."""
@@ -37,12 +260,28 @@ def _get_data_dir() -> Path:
     return data_dir
 
 
+def _find_model_file(model_path: Path) -> Optional[Path]:
+    """Get the preferred ONNX model file in a model directory.
+    
+    Args:
+        model_path: Directory containing the exported model(s)
+        
+    Returns:
+        Path to the first model file from MODEL_FILES that exists, or None
+    """
+    for model_file in MODEL_FILES:
+        candidate = model_path / model_file
+        if candidate.exists():
+            return candidate
+    return None
+
+
 def _get_model_path() -> Path:
     """Get the ONNX model path - bundled if available, otherwise use source."""
     base_path = _get_base_path()
     bundled_model = base_path / "models" / "onnx"
     
-    if bundled_model.exists() and (bundled_model / "model.onnx").exists():
+    if bundled_model.exists() and _find_model_file(bundled_model) is not None:
         logger.info(f"Using bundled ONNX model at {bundled_model}")
         return bundled_model
     else:
@@ -57,41 +296,152 @@ def _get_model_path() -> Path:
             )
 
 
+def _load_noise_index(index_path: Path) -> tuple[list[str], list[dict]]:
+    """Load the noise texts and metadata written by generate_embeddings.py.
+    
+    Args:
+        index_path: Path to noises.npz
+        
+    Returns:
+        Tuple of (texts, noise dicts), in embedding row order
+    """
+    with np.load(index_path, allow_pickle=False) as data:
+        texts = data["texts"].tolist()
+        if "meta" in data.files:
+            # Written before the fields were dictionary-encoded: one JSON
+            # object per noise
+            return texts, [json.loads(meta) for meta in data["meta"].tolist()]
+        
+        columns = []
+        for field in NOISE_FIELDS:
+            # Code -1 (no value) lands on the trailing None
+            values = data[f"{field}_values"].tolist() + [None]
+            columns.append([values[code] for code in data[f"{field}_codes"].tolist()])
+    
+    noises = [
+        {"text": text, **dict(zip(NOISE_FIELDS, fields))}
+        for text, *fields in zip(texts, *columns)
+    ]
+    return texts, noises
+
+
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """Prepare stored embeddings for similarity search.
+    
+    Args:
+        embeddings: Embedding matrix as stored on disk; int8 rows with
+            per-row scales dropped, or any float dtype
+        
+    Returns:
+        New float32, C-contiguous matrix with unit-length rows, so each query
+        is a single float32 matrix-vector product
+    """
+    normalized = np.array(embeddings, dtype=np.float32, order='C')
+    norms = np.linalg.norm(normalized, axis=1, keepdims=True)
+    np.clip(norms, 1e-12, None, out=norms)
+    normalized /= norms
+    return normalized
+
+
 class ONNXEmbedder:
     """ONNX-based text embedder using sentence-transformers model."""
     
-    def __init__(self, model_path: Path):
+    def __init__(
+        self,
+        model_path: Path,
+        intra_op_threads: int = 0,
+        inter_op_threads: int = 1,
+        optimization_level: str = "auto"
+    ):
         """Initialize the ONNX embedder.
         
         Args:
-            model_path: Path to directory containing model.onnx and tokenizer files
+            model_path: Path to directory containing the ONNX model and tokenizer files
+            intra_op_threads: Threads per operator, or 0 to choose automatically
+            inter_op_threads: Threads for running independent operators
+            optimization_level: Graph optimization level (see OPTIMIZATION_LEVELS);
+                on the pre-optimized model only "all" adds anything
         """
         import onnxruntime as ort
         from transformers import AutoTokenizer
         
         self.model_path = model_path
         
-        # Load tokenizer
+        # Load tokenizer (the Rust-backed one; the Python fallback is far slower)
         logger.info(f"Loading tokenizer from {model_path}")
-        self.tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_path), use_fast=True)
         
-        # Load ONNX model
-        onnx_path = model_path / "model.onnx"
+        # Load ONNX model (pre-optimized/INT8 if exported, otherwise FP32)
+        onnx_path = _find_model_file(model_path) or model_path / "model.onnx"
         logger.info(f"Loading ONNX model from {onnx_path}")
         
         # Configure ONNX Runtime for CPU
         sess_options = ort.SessionOptions()
-        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-        sess_options.intra_op_num_threads = 1  # Single thread for smaller footprint
+        # The shipped graph was fused at export time, so only the layout
+        # transforms of "all" (specific to this CPU) are left to run here
+        sess_options.graph_optimization_level = {
+            None: ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+            "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+            "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+            "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+        }[_session_optimization_level(onnx_path.name, optimization_level)]
+        sess_options.intra_op_num_threads = _resolve_intra_op_threads(intra_op_threads)
+        sess_options.inter_op_num_threads = inter_op_threads
+        sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # Small work blocks keep the few threads evenly busy on short inputs
+        sess_options.add_session_config_entry("session.dynamic_block_base", "4")
+        # Denormals only slow the math down; flushing them doesn't change the ranking
+        sess_options.add_session_config_entry("session.set_denormal_as_zero", "1")
         
         self.session = ort.InferenceSession(
             str(onnx_path),
             sess_options,
             providers=['CPUExecutionProvider']
         )
+        self._bind_buffers()
         
         logger.info("ONNX model loaded successfully")
     
+    def _bind_buffers(self):
+        """Set up the persistent buffers and IO binding for single-text encoding.
+        
+        The inputs are rebound on each call with that text's token count, but
+        always to the same memory, so ORT reads them in place. A model that
+        pools in the graph also writes its output straight into _out_buf.
+        """
+        # encode() can run on the warm-up thread and a capture thread at once
+        self._buffer_lock = threading.Lock()
+        
+        # A lone text has no padding, so the mask is all ones and the token
+        # types all zeros; only the ids change between calls
+        self._ids_buf = np.zeros((1, MAX_SEQ_LENGTH), dtype=np.int64)
+        self._mask_buf = np.ones((1, MAX_SEQ_LENGTH), dtype=np.int64)
+        self._type_buf = np.zeros((1, MAX_SEQ_LENGTH), dtype=np.int64)
+        
+        # Looked up once; the session's inputs never change
+        input_names = {i.name for i in self.session.get_inputs()}
+        self._needs_token_type = "token_type_ids" in input_names
+        self._bound_inputs = [
+            (name, buf)
+            for name, buf in (
+                ("input_ids", self._ids_buf),
+                ("attention_mask", self._mask_buf),
+                ("token_type_ids", self._type_buf),
+            )
+            if name in input_names
+        ]
+        
+        output = self.session.get_outputs()[0]
+        self._output_name = output.name
+        self._io_binding = self.session.io_binding()
+        self._out_buf = None
+        if len(output.shape) == 2 and isinstance(output.shape[1], int):
+            # Pooled output has a fixed (1, hidden_dim) shape for one text
+            self._out_buf = np.empty((1, output.shape[1]), dtype=np.float32)
+            self._io_binding.bind_output(
+                output.name, "cpu", 0, np.float32, self._out_buf.shape, self._out_buf.ctypes.data
+            )
+    
     def encode(self, text: str, convert_to_numpy: bool = True) -> np.ndarray:
         """Encode text to embedding vector.
         
@@ -102,13 +452,47 @@ def encode(self, text: str, convert_to_numpy: bool = True) -> np.ndarray:
         Returns:
             Embedding vector of shape (embedding_dim,)
         """
-        # Tokenize
+        # Plain-list tokenization, copied into the bound buffers
+        ids = self.tokenizer(text, truncation=True, max_length=MAX_SEQ_LENGTH)["input_ids"]
+        length = len(ids)
+        
+        with self._buffer_lock:
+            self._ids_buf[0, :length] = ids
+            
+            for name, buf in self._bound_inputs:
+                self._io_binding.bind_input(name, "cpu", 0, np.int64, (1, length), buf.ctypes.data)
+            if self._out_buf is None:
+                # The hidden state's shape follows the token count, so ORT
+                # allocates a fresh output each call
+                self._io_binding.bind_output(self._output_name, "cpu")
+            self.session.run_with_iobinding(self._io_binding)
+            
+            if self._out_buf is not None:
+                # The next call overwrites the buffer, so hand out a copy
+                return self._out_buf[0].copy()
+            return self._io_binding.copy_outputs_to_cpu()[0][0].mean(axis=0)
+    
+    def warm_up(self) -> None:
+        """Run throwaway inferences so the first real query skips kernel setup."""
+        for text in WARMUP_TEXTS:
+            self.encode(text)
+    
+    def encode_batch(self, texts: list[str]) -> np.ndarray:
+        """Encode several texts with a single inference call.
+        
+        Args:
+            texts: Texts to encode
+            
+        Returns:
+            Embedding matrix of shape (len(texts), embedding_dim)
+        """
+        # Tokenize, padding to the longest text in the batch
         inputs = self.tokenizer(
-            text,
+            texts,
             return_tensors="np",
             padding=True,
             truncation=True,
-            max_length=512
+            max_length=MAX_SEQ_LENGTH
         )
         
         # Run inference
@@ -118,7 +502,7 @@ def encode(self, text: str, convert_to_numpy: bool = True) -> np.ndarray:
         }
         
         # Add token_type_ids if the model expects it
-        if "token_type_ids" in [i.name for i in self.session.get_inputs()]:
+        if self._needs_token_type:
             input_feed["token_type_ids"] = inputs.get(
                 "token_type_ids",
                 np.zeros_like(inputs["input_ids"])
@@ -126,20 +510,24 @@ def encode(self, text: str, convert_to_numpy: bool = True) -> np.ndarray:
         
         outputs = self.session.run(None, input_feed)
         
-        # Mean pooling over token embeddings
-        # outputs[0] is last_hidden_state of shape (batch, seq_len, hidden_dim)
         embeddings = outputs[0]
-        attention_mask = inputs["attention_mask"]
+        if embeddings.ndim == 2:
+            # Current exports mean-pool inside the graph: (batch, hidden_dim)
+            return embeddings
         
-        # Expand attention mask for broadcasting
-        mask_expanded = np.expand_dims(attention_mask, -1).astype(np.float32)
+        # Older exports return last_hidden_state of shape
+        # (batch, seq_len, hidden_dim): mean-pool over the real tokens
+        attention_mask = inputs["attention_mask"]
         
-        # Sum embeddings where attention_mask is 1, then divide by count
-        sum_embeddings = np.sum(embeddings * mask_expanded, axis=1)
-        sum_mask = np.clip(np.sum(mask_expanded, axis=1), a_min=1e-9, a_max=None)
-        pooled = sum_embeddings / sum_mask
+        if len(texts) == 1:
+            # A lone text isn't padded, so every token counts
+            return embeddings.mean(axis=1)
         
-        return pooled[0]  # Return single vector, not batch
+        # Sum each row's embeddings where attention_mask is 1, without
+        # materializing the masked (batch, seq, dim) product, then divide by
+        # that row's token count
+        token_counts = attention_mask.sum(axis=1, keepdims=True).clip(min=1)
+        return np.einsum('bsd,bs->bd', embeddings, attention_mask.astype(embeddings.dtype)) / token_counts
 
 
 class CatNoiseFinder:
@@ -153,76 +541,177 @@ def __init__(
         self,
         noises_path: Optional[str] = None,
         embeddings_path: Optional[str] = None,
-        index_path: Optional[str] = None
+        index_path: Optional[str] = None,
+        intra_op_threads: int = 0,
+        inter_op_threads: int = 1,
+        optimization_level: str = "auto"
     ):
         """Initialize the finder with paths to data files.
         
         Args:
             noises_path: Path to cat_noises.json
             embeddings_path: Path to embeddings.npy
-            index_path: Path to noise_index.json
+            index_path: Path to noises.npz (written alongside embeddings.npy,
+                so its rows line up with the embeddings); used instead of
+                cat_noises.json when present
+            intra_op_threads: ONNX Runtime threads per operator (0 = automatic)
+            inter_op_threads: ONNX Runtime threads across operators
+            optimization_level: ONNX Runtime graph optimization level (see
+                OPTIMIZATION_LEVELS)
         """
         # Resolve paths relative to package location (handles PyInstaller)
         data_dir = _get_data_dir()
         
         self.noises_path = Path(noises_path) if noises_path else data_dir / "cat_noises.json"
         self.embeddings_path = Path(embeddings_path) if embeddings_path else data_dir / "embeddings.npy"
-        self.index_path = Path(index_path) if index_path else data_dir / "noise_index.json"
+        if index_path:
+            self.index_path: Optional[Path] = Path(index_path)
+        else:
+            # An explicitly chosen noises file wins over the default index
+            self.index_path = None if noises_path else data_dir / "noises.npz"
         
         logger.info(f"Noises path: {self.noises_path}, exists={self.noises_path.exists()}")
         logger.info(f"Embeddings path: {self.embeddings_path}, exists={self.embeddings_path.exists()}")
-        logger.info(f"Index path: {self.index_path}, exists={self.index_path.exists()}")
+        if self.index_path is not None:
+            logger.info(f"Index path: {self.index_path}, exists={self.index_path.exists()}")
+        
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.optimization_level = optimization_level
         
-        # Lazy-loaded components
+        # Lazy-loaded components; the lock keeps a background warm-up and
+        # the first query from loading them twice
+        self._load_lock = threading.Lock()
         self.model: Optional[ONNXEmbedder] = None
         self.noises: Optional[list[dict]] = None
         self.embeddings: Optional[np.ndarray] = None
         self._text_to_index: Optional[dict[str, int]] = None
+        self._short_match_texts: Optional[tuple[str, ...]] = None
+        # Substring lookup over the noise texts, for the partial-match boost
+        self._substring_index: Optional[_SubstringIndex] = None
+        # Category and text length of each row, for vectorized filtering
+        self._categories: Optional[np.ndarray] = None
+        self._text_lengths: Optional[np.ndarray] = None
+        # Normalized, read-only query embeddings by input text, least
+        # recently used first
+        self._embed_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        # Results of the previous find_similar call, keyed by (input, top_k)
+        self._last_query: Optional[tuple[str, int]] = None
+        self._last_results: list[dict] = []
+        # Rows of the base noises, sampled for empty input
+        self._base_indices: Optional[list[int]] = None
+        # Spare-capacity storage behind self.embeddings once custom noises
+        # are appended; self.embeddings is then a view of its first rows
+        self._embedding_buffer: Optional[np.ndarray] = None
     
     def _ensure_loaded(self) -> None:
-        """Lazy load model and data on first use."""
-        if self.model is None:
-            model_path = _get_model_path()
-            logger.info(f"Loading ONNX embedder from {model_path}...")
-            self.model = ONNXEmbedder(model_path)
-            logger.info("Model loaded successfully")
+        """Lazy load the noise data on first use.
         
+        The model waits for _ensure_model: lookups and queries for known
+        noise texts are answered from the precomputed embeddings alone.
+        """
+        with self._load_lock:
+            self._load()
+    
+    def _ensure_model(self) -> None:
+        """Lazy load the model the first time a text needs encoding."""
+        with self._load_lock:
+            if self.model is None:
+                model_path = _get_model_path()
+                logger.info(f"Loading ONNX embedder from {model_path}...")
+                self.model = ONNXEmbedder(
+                    model_path,
+                    intra_op_threads=self.intra_op_threads,
+                    inter_op_threads=self.inter_op_threads,
+                    optimization_level=self.optimization_level
+                )
+                logger.info("Model loaded successfully")
+    
+    def _load(self) -> None:
+        """Load whichever parts of the noise data aren't loaded yet."""
         if self.noises is None:
-            logger.info(f"Loading noises from {self.noises_path}...")
-            with open(self.noises_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self.noises = data["noises"]
+            if self.index_path is not None and self.index_path.exists():
+                logger.info(f"Loading noises from {self.index_path}...")
+                texts, self.noises = _load_noise_index(self.index_path)
+                self._text_to_index = dict(zip(texts, range(len(texts))))
+            else:
+                logger.info(f"Loading noises from {self.noises_path}...")
+                with open(self.noises_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.noises = data["noises"]
             logger.info(f"Loaded {len(self.noises)} noises")
         
         if self.embeddings is None:
             logger.info(f"Loading embeddings from {self.embeddings_path}...")
-            self.embeddings = np.load(self.embeddings_path)
+            # Converted once here: a compact stored matrix would otherwise be
+            # upcast on every query. Mapping the file lets the conversion read
+            # it in place instead of through a temporary in-memory copy. The
+            # scan itself stays float32: NumPy has no BLAS path for integer
+            # matmuls, so an int8 scan measures 3-5x slower than sgemv here
+            self.embeddings = _normalize_rows(np.load(self.embeddings_path, mmap_mode='r'))
             logger.info(f"Loaded embeddings with shape {self.embeddings.shape}")
         
         if self._text_to_index is None:
             self._text_to_index = {noise["text"]: i for i, noise in enumerate(self.noises)}
+        
+        if self._substring_index is None:
+            self._substring_index = _SubstringIndex(noise["text"] for noise in self.noises)
+        
+        if self._categories is None:
+            self._categories = np.array([noise["category"] for noise in self.noises], dtype=str)
+            self._text_lengths = np.array([len(noise["text"]) for noise in self.noises], dtype=np.int32)
+        
+        if self._base_indices is None:
+            self._base_indices = np.flatnonzero(self._categories == "base").tolist()
+    
+    def warm_up(self) -> None:
+        """Load everything and run throwaway work so the first keystroke is fast.
+        
+        The model's first inferences set up its kernels, and the first
+        similarity product starts the BLAS threads. Caches are left untouched.
+        """
+        self._ensure_loaded()
+        self._ensure_model()
+        self.model.warm_up()
+        # Only run for its side effect of starting the BLAS thread pool
+        _ = self.embeddings @ self.embeddings[0]
+    
+    def warm_up_in_thread(self) -> threading.Thread:
+        """Run warm_up in a background thread.
+        
+        Returns:
+            The started thread
+        """
+        thread = threading.Thread(target=self.warm_up, name="ModelWarmup", daemon=True)
+        thread.start()
+        return thread
     
     def find_similar(self, input_text: str, top_k: int = 5) -> list[dict]:
         """Find cat noises similar to input text.
         
+        A repeat of the previous input, or for longer inputs a one-keystroke
+        variation of it, gets the previous results back without a search.
+        
         Args:
             input_text: The captured keyboard input
             top_k: Number of results to return
             
         Returns:
-            List of dicts with keys: text, score, category, base_noise, variation_type
+            List of dicts with keys: text, score, weight (score squared, the
+            selection weight), category, base_noise, variation_type
         """
         self._ensure_loaded()
         
         if not input_text:
             # Return random base noises for empty input
             import random
-            base_noises = [n for n in self.noises if n["category"] == "base"]
-            selected = random.sample(base_noises, min(top_k, len(base_noises)))
+            chosen = random.sample(self._base_indices, min(top_k, len(self._base_indices)))
+            selected = [self.noises[i] for i in chosen]
             return [
                 {
                     "text": n["text"],
                     "score": 0.5,  # Neutral score for random selection
+                    "weight": 0.25,
                     "category": n["category"],
                     "base_noise": n["base_noise"],
                     "variation_type": n["variation_type"]
@@ -230,32 +719,89 @@ def find_similar(self, input_text: str, top_k: int = 5) -> list[dict]:
                 for n in selected
             ]
         
-        # Embed input
-        input_embedding = self.model.encode(input_text, convert_to_numpy=True)
+        if self._last_query is not None and self._is_near_repeat(input_text, top_k):
+            return list(self._last_results)
+        
+        # Dot product with unit-length rows gives cosine similarity
+        similarities = self.embeddings @ self._embed_query(input_text)
+        results = self._rank(input_text, similarities, top_k)
+        self._last_query = (input_text, top_k)
+        self._last_results = results
+        return list(results)
+    
+    def _is_near_repeat(self, input_text: str, top_k: int) -> bool:
+        """Check whether the previous results can stand in for this query."""
+        last_text, last_top_k = self._last_query
+        if top_k != last_top_k:
+            return False
+        if input_text == last_text:
+            return True
+        return (
+            min(len(input_text), len(last_text)) >= MIN_NEAR_REPEAT_LENGTH
+            and _within_one_edit(input_text, last_text)
+        )
+    
+    def find_similar_batch(self, input_texts: list[str], top_k: int = 5) -> list[list[dict]]:
+        """Find cat noises similar to each of several inputs.
+        
+        Inputs that aren't cached yet are embedded with one inference call,
+        and all similarities come from one matrix product.
+        
+        Args:
+            input_texts: Captured keyboard inputs
+            top_k: Number of results to return per input
+            
+        Returns:
+            One find_similar result list per input, in input order
+        """
+        self._ensure_loaded()
         
-        # Compute cosine similarities
-        similarities = self._batch_cosine_similarity(self.embeddings, input_embedding)
+        queries = [text for text in input_texts if text]
+        similarities = iter(())
+        if queries:
+            # One row of similarities per non-empty input
+            similarities = iter(np.stack(self._embed_queries(queries)) @ self.embeddings.T)
         
+        return [
+            self._rank(text, next(similarities), top_k) if text
+            else self.find_similar(text, top_k)
+            for text in input_texts
+        ]
+    
+    def _rank(self, input_text: str, similarities: np.ndarray, top_k: int) -> list[dict]:
+        """Boost text matches and turn similarities into find_similar results.
+        
+        Args:
+            input_text: The captured keyboard input
+            similarities: Cosine similarity to every noise; boosted in place
+            top_k: Number of results to return
+            
+        Returns:
+            Result dicts as described in find_similar, best first
+        """
         # Boost exact matches
-        if input_text.lower() in self._text_to_index:
-            idx = self._text_to_index[input_text.lower()]
+        query = input_text.lower()
+        if query in self._text_to_index:
+            idx = self._text_to_index[query]
             similarities[idx] = min(1.0, similarities[idx] + 0.3)
         
         # Also check for partial matches in our noise database
-        for text, idx in self._text_to_index.items():
-            if input_text.lower() in text.lower() or text.lower() in input_text.lower():
-                similarities[idx] = min(1.0, similarities[idx] + 0.1)
+        hits = self._substring_index.hits(query)
+        if hits:
+            similarities[hits] = np.minimum(1.0, similarities[hits] + 0.1)
         
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
+        top_indices = _top_k(similarities, top_k)
         
-        # Build results
+        # Build results, squaring the scores in one go
+        top_scores = similarities[top_indices]
+        top_weights = top_scores * top_scores
         results = []
-        for idx in top_indices:
+        for idx, score, weight in zip(top_indices, top_scores.tolist(), top_weights.tolist()):
             noise = self.noises[idx]
             results.append({
                 "text": noise["text"],
-                "score": float(similarities[idx]),
+                "score": score,
+                "weight": weight,
                 "category": noise["category"],
                 "base_noise": noise["base_noise"],
                 "variation_type": noise["variation_type"]
@@ -263,27 +809,73 @@ def find_similar(self, input_text: str, top_k: int = 5) -> list[dict]:
         
         return results
     
-    def _batch_cosine_similarity(self, embeddings: np.ndarray, query: np.ndarray) -> np.ndarray:
-        """Compute cosine similarity between query and all embeddings.
+    def _embed_query(self, text: str) -> np.ndarray:
+        """Embed a query as a unit-length float32 vector, reusing recent results.
+        
+        Args:
+            text: The query text
+            
+        Returns:
+            Normalized, read-only embedding of shape (embedding_dim,)
+        """
+        embedding = self._embed_cache.get(text)
+        if embedding is None:
+            return self._embed_queries([text])[0]
+        self._embed_cache.move_to_end(text)
+        return embedding
+    
+    def _embed_queries(self, texts: list[str]) -> list[np.ndarray]:
+        """Embed queries as unit-length float32 vectors, reusing recent results.
+        
+        Texts that are noises in the database reuse their stored row; other
+        uncached texts are encoded together in a single batch.
         
         Args:
-            embeddings: Matrix of shape (n_samples, embedding_dim)
-            query: Vector of shape (embedding_dim,)
+            texts: The query texts
             
         Returns:
-            Array of similarities of shape (n_samples,)
+            Normalized, read-only embeddings of shape (embedding_dim,), in
+            input order
         """
-        # Normalize query
-        query_norm = query / np.linalg.norm(query)
+        known = self._text_to_index or {}
+        stored, novel = [], []
+        for text in dict.fromkeys(texts):
+            if text in self._embed_cache:
+                self._embed_cache.move_to_end(text)
+            else:
+                (stored if text in known else novel).append(text)
         
-        # Normalize embeddings (row-wise)
-        embedding_norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        normalized_embeddings = embeddings / embedding_norms
+        batches = []
+        if stored:
+            # Noise texts already have a normalized row, so skip the model
+            batches.append((stored, self.embeddings[[known[text] for text in stored]]))
+        if novel:
+            self._ensure_model()
+            if len(novel) == 1:
+                # The usual keystroke case: the single-text path skips padding
+                vectors = self.model.encode(novel[0])[np.newaxis]
+            else:
+                vectors = self.model.encode_batch(novel)
+            batches.append((novel, _normalize_rows(vectors)))
         
-        # Dot product gives cosine similarity for normalized vectors
-        similarities = np.dot(normalized_embeddings, query_norm)
+        embedded: dict[str, np.ndarray] = {}
+        for batch_texts, vectors in batches:
+            # The rows are handed out from the cache, so callers can't
+            # change them under later queries
+            vectors.setflags(write=False)
+            embedded.update(zip(batch_texts, vectors))
+        for text, embedding in embedded.items():
+            if len(self._embed_cache) >= EMBED_CACHE_SIZE:
+                self._embed_cache.popitem(last=False)
+            self._embed_cache[text] = embedding
         
-        return similarities
+        # A big batch can evict its own early entries, so prefer the batch
+        return [embedded[text] if text in embedded else self._embed_cache[text] for text in texts]
+    
+    def invalidate_cache(self) -> None:
+        """Forget cached query embeddings and results, e.g. after swapping the model."""
+        self._embed_cache.clear()
+        self._last_query = None
     
     def get_noise_by_category(self, category: str) -> list[dict]:
         """Get all noises in a specific category.
@@ -295,7 +887,7 @@ def get_noise_by_category(self, category: str) -> list[dict]:
             List of noise dicts in that category
         """
         self._ensure_loaded()
-        return [n for n in self.noises if n["category"] == category]
+        return self._rows(self._categories == category)
     
     def get_short_noises(self, max_length: int = 5) -> list[dict]:
         """Get noises with text length <= max_length.
@@ -307,7 +899,45 @@ def get_short_noises(self, max_length: int = 5) -> list[dict]:
             List of short noise dicts
         """
         self._ensure_loaded()
-        return [n for n in self.noises if len(n["text"]) <= max_length]
+        return self._rows(self._text_lengths <= max_length)
+    
+    def _rows(self, mask: np.ndarray) -> list[dict]:
+        """Get the noises where a per-row mask is set.
+        
+        Args:
+            mask: Boolean array with one entry per noise
+            
+        Returns:
+            The selected noise dicts, in row order
+        """
+        noises = self.noises
+        return [noises[i] for i in np.flatnonzero(mask).tolist()]
+    
+    def has_short_match(self, input_text: str) -> bool:
+        """Cheaply check whether a short noise plausibly matches the input.
+        
+        A short noise (up to SHORT_MATCH_MAX_LENGTH characters) matches if it
+        shares the input's first two letters or either text contains the
+        other. No embedding is computed.
+        
+        Args:
+            input_text: The captured keyboard input
+            
+        Returns:
+            True if find_similar is likely to turn up a short noise
+        """
+        self._ensure_loaded()
+        if self._short_match_texts is None:
+            self._short_match_texts = tuple(
+                n["text"].lower() for n in self.get_short_noises(SHORT_MATCH_MAX_LENGTH)
+            )
+        
+        text = input_text.lower()
+        prefix = text[:2]
+        return any(
+            short.startswith(prefix) or text in short or short in text
+            for short in self._short_match_texts
+        )
     
     def add_custom_noises(self, custom_noises: list[str]) -> None:
         """Add custom noises to the noise database.
@@ -320,27 +950,54 @@ def add_custom_noises(self, custom_noises: list[str]) -> None:
         
         self._ensure_loaded()
         
-        for noise_text in custom_noises:
-            if noise_text and noise_text not in self._text_to_index:
-                # Create noise entry
-                noise_entry = {
+        new_texts = [
+            text for text in dict.fromkeys(custom_noises)
+            if text and text not in self._text_to_index
+        ]
+        if new_texts:
+            # Embed all new noises in one batch, normalize like the
+            # precomputed rows, and add
+            self._ensure_model()
+            self._append_embeddings(_normalize_rows(self.model.encode_batch(new_texts)))
+            
+            # Update index
+            for noise_text in new_texts:
+                self._text_to_index[noise_text] = len(self.noises)
+                self.noises.append({
                     "text": noise_text,
                     "category": "custom",
                     "base_noise": noise_text,
                     "variation_type": "custom"
-                }
-                
-                # Embed and add
-                embedding = self.model.encode(noise_text, convert_to_numpy=True)
-                self.embeddings = np.vstack([self.embeddings, embedding.reshape(1, -1)])
-                
-                # Update index
-                idx = len(self.noises)
-                self._text_to_index[noise_text] = idx
-                self.noises.append(noise_entry)
+                })
+            self._categories = np.concatenate([self._categories, np.full(len(new_texts), "custom")])
+            self._text_lengths = np.concatenate([
+                self._text_lengths,
+                np.array([len(t) for t in new_texts], dtype=np.int32)
+            ])
+            self._substring_index = _SubstringIndex(noise["text"] for noise in self.noises)
+            self._short_match_texts = None
+            self._last_query = None
         
         logger.info(f"Added {len(custom_noises)} custom noises, total: {len(self.noises)}")
     
+    def _append_embeddings(self, rows: np.ndarray) -> None:
+        """Append rows to the embeddings, growing storage geometrically.
+        
+        Like list.append, capacity at least doubles when it runs out, so
+        repeated additions don't copy the whole matrix every time.
+        
+        Args:
+            rows: Normalized float32 rows of shape (k, embedding_dim)
+        """
+        n = len(self.embeddings)
+        needed = n + len(rows)
+        if self._embedding_buffer is None or len(self._embedding_buffer) < needed:
+            buffer = np.empty((max(2 * n, needed), self.embeddings.shape[1]), dtype=np.float32)
+            buffer[:n] = self.embeddings
+            self._embedding_buffer = buffer
+        self._embedding_buffer[n:needed] = rows
+        self.embeddings = self._embedding_buffer[:needed]
+    
     def set_custom_noises(self, custom_noises: list[str]) -> None:
         """Replace all custom noises with a new set.
         
@@ -350,14 +1007,21 @@ def set_custom_noises(self, custom_noises: list[str]) -> None:
         self._ensure_loaded()
         
         # Remove existing custom noises
-        non_custom_mask = [n["category"] != "custom" for n in self.noises]
+        non_custom_mask = self._categories != "custom"
         
-        # Filter noises and embeddings
-        self.noises = [n for i, n in enumerate(self.noises) if non_custom_mask[i]]
+        # Filter noises, embeddings and metadata columns
+        self.noises = self._rows(non_custom_mask)
         self.embeddings = self.embeddings[non_custom_mask]
+        self._embedding_buffer = None
+        self._categories = self._categories[non_custom_mask]
+        self._text_lengths = self._text_lengths[non_custom_mask]
+        self._base_indices = np.flatnonzero(self._categories == "base").tolist()
         
         # Rebuild index
         self._text_to_index = {noise["text"]: i for i, noise in enumerate(self.noises)}
+        self._substring_index = _SubstringIndex(noise["text"] for noise in self.noises)
+        self._short_match_texts = None
+        self._last_query = None
         
         # Add new custom noises
         self.add_custom_noises(custom_noises)
@@ -4,10 +4,21 @@
 kitty out of the bag! Or back in. Cats are fickle like that. 🐱
 """
 
+from types import MappingProxyType
 from typing import Callable, Optional, Set
 
 from pynput import keyboard
 
+# Left/right modifier variants mapped to their base key
+_KEY_MAP = MappingProxyType({
+    keyboard.Key.ctrl_l: keyboard.Key.ctrl,
+    keyboard.Key.ctrl_r: keyboard.Key.ctrl,
+    keyboard.Key.shift_l: keyboard.Key.shift,
+    keyboard.Key.shift_r: keyboard.Key.shift,
+    keyboard.Key.alt_l: keyboard.Key.alt,
+    keyboard.Key.alt_r: keyboard.Key.alt,
+})
+
 
 class KittyModeToggle:
     """Handles the hotkey toggle for Kitty Mode.
@@ -59,10 +70,15 @@ def _on_press(self, key) -> None:
         Args:
             key: The key that was pressed
         """
-        # Normalize key (handle left/right variants)
-        normalized = self._normalize_key(key)
-        self.current_keys.add(normalized)
-        self._check_hotkey(key)
+        if not isinstance(key, keyboard.Key):
+            # Character keys - nearly every keystroke - are never modifiers,
+            # so the only question is whether this one completes the hotkey
+            self._check_hotkey(key)
+            return
+        
+        # Special key: track it, normalized (handle left/right variants).
+        # It has no character, so it can't complete the hotkey
+        self.current_keys.add(self._normalize_key(key))
     
     def _on_release(self, key) -> None:
         """Handle key release event.
@@ -70,6 +86,9 @@ def _on_release(self, key) -> None:
         Args:
             key: The key that was released
         """
+        if not isinstance(key, keyboard.Key):
+            return  # Character keys are never tracked
+        
         normalized = self._normalize_key(key)
         self.current_keys.discard(normalized)
         
@@ -86,16 +105,7 @@ def _normalize_key(self, key) -> keyboard.Key:
         Returns:
             Normalized key
         """
-        # Map left/right variants to base key
-        key_map = {
-            keyboard.Key.ctrl_l: keyboard.Key.ctrl,
-            keyboard.Key.ctrl_r: keyboard.Key.ctrl,
-            keyboard.Key.shift_l: keyboard.Key.shift,
-            keyboard.Key.shift_r: keyboard.Key.shift,
-            keyboard.Key.alt_l: keyboard.Key.alt,
-            keyboard.Key.alt_r: keyboard.Key.alt,
-        }
-        return key_map.get(key, key)
+        return _KEY_MAP.get(key, key)
     
     def _check_hotkey(self, trigger_key) -> None:
         """Check if hotkey combination is pressed.
@@ -1,9 +1,23 @@
 """Pytest configuration and shared fixtures."""
 
+import hashlib
 import os
+import threading
+from pathlib import Path
+
+import numpy as np
 import pytest
 
 
+# Queries the model-backed tests search for, embedded once per model and
+# kept in pytest's cache directory so later runs don't encode them at all
+TEST_QUERIES = (
+    "meow", "test", "hello", "qwerty", "asdfghjkl", "asdfmeow", "qwertyuiop",
+    "keyboard smash", "test input", "qwertyuiopasdfghjkl", "a" * 20,
+)
+QUERY_EMBEDDINGS_FILE = "query_embeddings.npz"
+
+
 def pytest_configure(config):
     """Configure pytest environment before tests run."""
     # Force HuggingFace to use cached models only (no network calls)
@@ -15,13 +29,217 @@ def pytest_configure(config):
     os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
 
 
-@pytest.fixture(scope="session")
-def preloaded_finder():
-    """Pre-load the CatNoiseFinder once for all tests that need it.
+def pytest_addoption(parser):
+    """Add options for running the timer-bound tests on a shorter clock."""
+    parser.addoption(
+        "--time-scale", type=float, default=1.0, dest="time_scale",
+        help="multiply capture window durations and test sleeps by this factor"
+    )
+    parser.addoption(
+        "--fast", action="store_const", const=0.1, dest="time_scale",
+        help="shorthand for --time-scale=0.1"
+    )
+
+
+# The shared finder and the thread warming it up, set at collection time
+_FINDER_KEY = pytest.StashKey[object]()
+_WARMUP_KEY = pytest.StashKey[threading.Thread]()
+
+
+def pytest_collection_modifyitems(config, items):
+    """Start loading the shared finder in the background if any test needs it.
     
-    This avoids repeated model loading overhead.
+    The model loads while the tests that don't need it run, instead of
+    stalling whichever test first asks for the finder fixture.
     """
+    if not any("finder" in item.fixturenames for item in items):
+        return
+    
     from src.kittymode.similarity_search import CatNoiseFinder
     finder = CatNoiseFinder()
-    finder._ensure_loaded()
+    
+    def warm_up():
+        try:
+            finder.warm_up()
+        except Exception:
+            pass  # The finder fixture warms up again and reports it there
+    
+    config.stash[_FINDER_KEY] = finder
+    config.stash[_WARMUP_KEY] = threading.Thread(target=warm_up, name="TestModelWarmup", daemon=True)
+    config.stash[_WARMUP_KEY].start()
+
+
+def pytest_runtest_setup(item):
+    """Let the background warm-up finish before a real-timer test starts.
+    
+    Model loading and inference compete for the CPU, which would throw off
+    the tests that check what happens within a few dozen milliseconds.
+    """
+    warmup = item.config.stash.get(_WARMUP_KEY, None)
+    if warmup is not None and item.get_closest_marker("timing") is not None:
+        warmup.join()
+
+
+@pytest.fixture(scope="session")
+def finder(pytestconfig):
+    """The CatNoiseFinder shared by all tests that need it.
+    
+    Loaded and warmed up once, in the background from collection time on,
+    so no test pays for the model load or first-inference setup.
+    Tests share it, so they must not add or replace custom noises.
+    """
+    finder = pytestconfig.stash.get(_FINDER_KEY, None)
+    if finder is None:
+        from src.kittymode.similarity_search import CatNoiseFinder
+        finder = CatNoiseFinder()
+    else:
+        pytestconfig.stash[_WARMUP_KEY].join()
+    # Cheap once the background run has loaded everything, and raises
+    # here if it couldn't
+    finder.warm_up()
+    # No cache directory under -p no:cacheprovider; the queries then just
+    # go through the model like any other input
+    cache = getattr(pytestconfig, "cache", None)
+    if cache is not None:
+        _seed_query_embeddings(finder, cache.mkdir("kittymode"))
     return finder
+
+
+def _model_key() -> np.ndarray:
+    """Identify the model and encoding code that query embeddings come from.
+    
+    Returns:
+        Array of the model file's path, size and modification time, and a
+        hash of similarity_search.py so changes to tokenization, pooling or
+        normalization re-encode the queries
+    """
+    from src.kittymode import similarity_search
+    model_file = similarity_search._find_model_file(similarity_search._get_model_path())
+    stat = model_file.stat()
+    code_hash = hashlib.sha256(Path(similarity_search.__file__).read_bytes()).hexdigest()
+    return np.array([str(model_file), str(stat.st_size), str(stat.st_mtime_ns), code_hash])
+
+
+def _seed_query_embeddings(finder, cache_dir: Path) -> None:
+    """Put TEST_QUERIES in the finder's query cache, encoding them at most once per model.
+    
+    Args:
+        finder: A loaded CatNoiseFinder
+        cache_dir: Directory to keep the embeddings in between runs
+    """
+    path = cache_dir / QUERY_EMBEDDINGS_FILE
+    key = _model_key()
+    embeddings = None
+    try:
+        with np.load(path) as cached:
+            if (np.array_equal(cached["model_key"], key)
+                    and cached["texts"].tolist() == list(TEST_QUERIES)):
+                embeddings = cached["embeddings"]
+    except (OSError, KeyError, ValueError):
+        pass
+    
+    if embeddings is None:
+        embeddings = np.stack(finder._embed_queries(list(TEST_QUERIES)))
+        # Written aside and swapped in, since xdist workers may race here
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.npz")
+        np.savez(tmp_path, model_key=key, texts=np.array(TEST_QUERIES), embeddings=embeddings)
+        os.replace(tmp_path, path)
+    
+    # Read-only like the finder's own cache entries
+    embeddings = np.array(embeddings, dtype=np.float32)
+    embeddings.setflags(write=False)
+    finder._embed_cache.update(zip(TEST_QUERIES, embeddings))
+
+
+@pytest.fixture
+def selector(finder):
+    """Create a fresh NoiseSelector around the shared finder."""
+    from src.kittymode.noise_selector import NoiseSelector
+    return NoiseSelector(finder)
+
+
+@pytest.fixture(scope="session")
+def time_scale(pytestconfig):
+    """Factor applied to capture window durations and the sleeps around them."""
+    return pytestconfig.getoption("time_scale")
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when a test moves it."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, ms: float) -> None:
+        """Move the clock forward and let windows on it that are now due close."""
+        from src.kittymode.capture_window import CaptureWindow
+        self.now += ms / 1000
+        CaptureWindow.clock_advanced(self)
+
+
+@pytest.fixture
+def fake_clock():
+    """A FakeClock to pass to CaptureWindow as clock, released after the test."""
+    from src.kittymode.capture_window import CaptureWindow
+    clock = FakeClock()
+    yield clock
+    CaptureWindow.release_clock(clock)
+
+
+@pytest.fixture(scope="session")
+def window_pool():
+    """Idle CaptureWindows, keyed by their sorted keyword arguments."""
+    return {}
+
+
+@pytest.fixture
+def make_window(window_pool, time_scale):
+    """Build CaptureWindows that signal each time they complete.
+    
+    Returns a factory taking CaptureWindow's keyword arguments and returning
+    (window, results, done): results collects the (text, count) pairs passed
+    to on_complete and done is set after each one, so tests wait exactly as
+    long as the window takes instead of sleeping a fixed margin.
+    
+    Durations (the *_ms arguments) are multiplied by time_scale unless the
+    window runs on a fake clock; tests scale their own sleeps to match.
+    Real-clock windows come from a session-wide pool: an idle one with the
+    same settings gets the new callback, and on teardown each window is
+    cancelled back to idle and returned to the pool. Fake-clock windows
+    are built fresh, since each test has its own clock.
+    """
+    from src.kittymode.capture_window import CaptureWindow
+    
+    handed_out = []
+    
+    def factory(**kwargs):
+        results = []
+        done = threading.Event()
+        
+        def on_complete(text, count):
+            results.append((text, count))
+            done.set()
+        
+        if "clock" in kwargs:
+            return CaptureWindow(on_complete=on_complete, **kwargs), results, done
+        
+        kwargs = {
+            name: max(1, round(value * time_scale)) if name.endswith("_ms") else value
+            for name, value in kwargs.items()
+        }
+        key = tuple(sorted(kwargs.items()))
+        idle = window_pool.setdefault(key, [])
+        window = idle.pop() if idle else CaptureWindow(**kwargs)
+        window.on_complete = on_complete
+        handed_out.append((key, window))
+        return window, results, done
+    
+    yield factory
+    
+    for key, window in handed_out:
+        window.cancel()
+        window.on_complete = None
+        window_pool[key].append(window)
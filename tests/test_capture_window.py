@@ -1,150 +1,184 @@
 """Tests for CaptureWindow."""
 
-import time
-
 import pytest
 
-from src.kittymode.capture_window import CaptureWindow
-
 
-def test_capture_window_basic():
-    """Test basic capture window accumulation."""
-    result = []
-    window = CaptureWindow(
-        window_duration_ms=100,
-        on_complete=lambda s, c: result.append((s, c))
-    )
-    window.add_key('a')
-    window.add_key('s')
-    window.add_key('d')
-    time.sleep(0.2)  # Wait for window to close
-    assert result == [('asd', 3)]
+# (CaptureWindow kwargs, steps, expected results), run on a fake clock. Steps
+# are strings of keys typed back to back, pauses in milliseconds, or None to
+# let the open window close; the test closes the last window by itself.
+SCENARIOS = [
+    pytest.param(
+        {"window_duration_ms": 100}, ("asd",), [("asd", 3)], id="basic"
+    ),
+    pytest.param(
+        {"window_duration_ms": 100}, ("hello",), [("hello", 5)], id="word"
+    ),
+    pytest.param(
+        {"window_duration_ms": 100}, ("!@# $",), [("!@# $", 5)], id="special-characters"
+    ),
+    # Multi-byte characters count as single characters
+    pytest.param(
+        {"window_duration_ms": 100}, ("ñyá🐱",), [("ñyá🐱", 4)], id="non-ascii"
+    ),
+    # Keypresses near the timeout extend the window
+    pytest.param(
+        {"window_duration_ms": 100, "extension_threshold_ms": 50, "max_duration_ms": 500},
+        ("a", 80, "b", 80, "c"),
+        [("abc", 3)],
+        id="extension",
+    ),
+    pytest.param(
+        {"window_duration_ms": 100, "extension_threshold_ms": 50},
+        ("a", 70, "b", 70, "c"),
+        [("abc", 3)],
+        id="extension-default-max",
+    ),
+    # The buffer starts empty again after each window
+    pytest.param(
+        {"window_duration_ms": 50}, ("ab", None, "xy"), [("ab", 2), ("xy", 2)], id="multiple-windows"
+    ),
+]
+
+
+@pytest.mark.parametrize("window_kwargs, steps, expected", SCENARIOS)
+def test_capture_window_scenarios(make_window, fake_clock, window_kwargs, steps, expected):
+    """Test what the window reports for timed sequences of keypresses."""
+    window, result, done = make_window(clock=fake_clock, **window_kwargs)
+    
+    for step in (*steps, None):
+        if step is None:
+            # Past any deadline the window can have
+            fake_clock.advance(window.max_duration_ms)
+            assert done.wait(1)  # Returns as soon as the window closes
+            done.clear()
+        elif isinstance(step, str):
+            for char in step:
+                window.add_key(char)
+        else:
+            fake_clock.advance(step)
+    
+    assert result == expected
 
 
-def test_capture_window_empty_no_callback():
+@pytest.mark.timing
+def test_capture_window_empty_no_callback(make_window, time_scale):
     """Test that callback is not called for empty buffer."""
-    result = []
-    window = CaptureWindow(
-        window_duration_ms=50,
-        on_complete=lambda s, c: result.append((s, c))
-    )
+    window, result, done = make_window(window_duration_ms=50)
     # Don't add any keys
-    time.sleep(0.1)
+    assert not done.wait(0.05 * time_scale)
     assert result == []
 
 
-def test_capture_window_extension():
-    """Test that window extends when keypresses arrive near timeout."""
-    result = []
-    window = CaptureWindow(
-        window_duration_ms=100,
-        extension_threshold_ms=50,
-        max_duration_ms=500,
-        on_complete=lambda s, c: result.append((s, c))
-    )
-    
-    window.add_key('a')
-    time.sleep(0.08)  # 80ms - near the 100ms timeout
-    window.add_key('b')  # Should extend window
-    time.sleep(0.08)  # Another 80ms
-    window.add_key('c')  # Should extend again
-    time.sleep(0.15)  # Wait for window to close
-    
-    assert result == [('abc', 3)]
-
-
-def test_capture_window_max_duration():
+def test_capture_window_max_duration(make_window, fake_clock):
     """Test that window respects maximum duration."""
-    result = []
-    window = CaptureWindow(
+    window, result, done = make_window(
         window_duration_ms=100,
         extension_threshold_ms=50,
         max_duration_ms=200,  # Short max for testing
-        on_complete=lambda s, c: result.append((s, c))
+        clock=fake_clock
     )
     
-    # Keep adding keys rapidly - window should still close at max_duration
-    window.add_key('a')
-    time.sleep(0.05)
-    window.add_key('b')
-    time.sleep(0.05)
-    window.add_key('c')
-    time.sleep(0.05)
-    window.add_key('d')
-    time.sleep(0.05)
-    window.add_key('e')
-    
-    # Wait for max duration to pass
-    time.sleep(0.3)
+    # Keep adding keys every 50ms - window should still close at max_duration
+    for char in 'abcd':
+        window.add_key(char)
+        fake_clock.advance(50)
     
-    # Should have captured something (exact amount depends on timing)
-    assert len(result) >= 1
-    assert len(result[0][0]) >= 1
+    assert done.wait(1)
+    assert result == [('abcd', 4)]
 
 
-def test_capture_window_cancel():
+@pytest.mark.timing
+def test_capture_window_cancel(make_window, time_scale):
     """Test that cancel prevents callback."""
-    result = []
-    window = CaptureWindow(
-        window_duration_ms=100,
-        on_complete=lambda s, c: result.append((s, c))
-    )
+    window, result, done = make_window(window_duration_ms=100)
     
     window.add_key('a')
     window.add_key('b')
     window.cancel()
-    time.sleep(0.15)
+    # Nothing to wait for, so cover the whole window
+    assert not done.wait(0.15 * time_scale)
     
     assert result == []
 
 
-def test_capture_window_is_active():
+@pytest.mark.timing
+def test_capture_window_is_active(make_window):
     """Test is_active state tracking."""
-    window = CaptureWindow(window_duration_ms=100)
+    window, result, done = make_window(window_duration_ms=100)
     
     assert not window.is_active()
     
     window.add_key('a')
     assert window.is_active()
     
-    time.sleep(0.15)
+    # The window resets before calling back
+    assert done.wait(1)
     assert not window.is_active()
 
 
-def test_capture_window_multiple_windows():
-    """Test multiple capture windows in sequence."""
-    result = []
-    window = CaptureWindow(
-        window_duration_ms=50,
-        on_complete=lambda s, c: result.append((s, c))
-    )
+@pytest.mark.timing
+def test_capture_windows_share_one_scheduler_thread(make_window):
+    """Test that neither keypresses nor new windows start a thread each."""
+    import threading
+    
+    first, first_result, first_done = make_window(window_duration_ms=50)
+    second, second_result, second_done = make_window(window_duration_ms=100)
+    
+    first.add_key('a')
+    threads_after_first_key = threading.active_count()
+    for char in 'sdfghjkl':
+        first.add_key(char)
+    second.add_key('b')
+    assert threading.active_count() == threads_after_first_key
+    
+    assert first_done.wait(1) and second_done.wait(1)
+    assert first_result == [('asdfghjkl', 9)]
+    assert second_result == [('b', 1)]
+
+
+@pytest.mark.timing
+def test_capture_window_restarted_after_cancel(make_window):
+    """Test that a window started after a cancel closes on its own schedule."""
+    window, result, done = make_window(window_duration_ms=100)
     
-    # First window
     window.add_key('a')
+    window.cancel()
     window.add_key('b')
-    time.sleep(0.1)
     
-    # Second window
-    window.add_key('x')
-    window.add_key('y')
-    time.sleep(0.1)
+    assert done.wait(1)
+    assert result == [('b', 1)]
+
+
+def test_failing_callback_does_not_stop_other_windows(make_window, fake_clock, caplog):
+    """Test that an exception in one callback leaves the shared scheduler running."""
+    broken, _, _ = make_window(window_duration_ms=100, clock=fake_clock)
     
-    assert result == [('ab', 2), ('xy', 2)]
+    def fail(text, count):
+        raise RuntimeError("keyboard output failed")
+    broken.on_complete = fail
+    window, result, done = make_window(window_duration_ms=100, clock=fake_clock)
+    
+    broken.add_key('a')
+    fake_clock.advance(100)
+    window.add_key('b')
+    fake_clock.advance(100)
+    
+    assert done.wait(1)
+    assert result == [('b', 1)]
+    assert not broken.is_active()
+    assert "keyboard output failed" in caplog.text
 
 
-def test_capture_window_special_characters():
-    """Test capture of special characters."""
-    result = []
-    window = CaptureWindow(
-        window_duration_ms=100,
-        on_complete=lambda s, c: result.append((s, c))
-    )
+def test_released_clock_stops_its_scheduler(fake_clock):
+    """Test that releasing a fake clock ends and forgets its scheduler thread."""
+    from src.kittymode import capture_window
+    from src.kittymode.capture_window import CaptureWindow
     
-    window.add_key('!')
-    window.add_key('@')
-    window.add_key('#')
-    window.add_key(' ')
-    window.add_key('$')
-    time.sleep(0.2)
+    window = CaptureWindow(window_duration_ms=100, clock=fake_clock)
+    window.add_key('a')
+    worker = capture_window._schedulers[fake_clock]._worker
     
-    assert result == [('!@# $', 5)]
+    CaptureWindow.release_clock(fake_clock)
+    worker.join(1)
+    assert not worker.is_alive()
+    assert fake_clock not in capture_window._schedulers
@@ -3,9 +3,32 @@
 import pytest
 import tempfile
 import json
+import time
 from pathlib import Path
 
-from src.kittymode.config import ConfigManager, DEFAULT_CONFIG
+from src.kittymode.config import (
+    ConfigManager,
+    DEFAULT_CONFIG,
+    DictStorage,
+    JsonFileStorage,
+    SAVE_DEBOUNCE_S,
+)
+
+
+@pytest.fixture
+def config_factory():
+    """Create in-memory config managers, closing them after the test."""
+    managers = []
+    
+    def make(storage=None):
+        manager = ConfigManager(storage=storage or DictStorage())
+        managers.append(manager)
+        return manager
+    
+    yield make
+    
+    for manager in managers:
+        manager.close()
 
 
 @pytest.fixture
@@ -17,54 +40,90 @@ def mock_config_dir(self):
             path.mkdir(parents=True, exist_ok=True)
             return path
         monkeypatch.setattr(ConfigManager, '_get_config_dir', mock_config_dir)
+        
+        # Flush pending debounced saves before the directory goes away
+        managers = []
+        original_init = ConfigManager.__init__
+        def tracking_init(self, *args, **kwargs):
+            original_init(self, *args, **kwargs)
+            managers.append(self)
+        monkeypatch.setattr(ConfigManager, '__init__', tracking_init)
+        
         yield tmpdir
+        
+        for manager in managers:
+            manager.close()
 
 
-def test_default_config_loaded(temp_config):
+def test_default_config_loaded(config_factory):
     """Test that default config is loaded correctly."""
-    config = ConfigManager()
+    config = config_factory()
     assert config.get('window_duration_ms') == 800
     assert config.get('enabled_by_default') == False
 
 
-def test_config_save_and_load(temp_config):
-    """Test that config persists across instances."""
-    config = ConfigManager()
+def test_config_save_and_load(config_factory):
+    """Test that config persists across instances sharing a storage."""
+    config = config_factory()
     config.set('window_duration_ms', 1200)
+    config.close()
     
     # Create new instance to test persistence
+    config2 = config_factory(config.storage)
+    assert config2.get('window_duration_ms') == 1200
+
+
+def test_config_save_and_load_from_disk(temp_config):
+    """Test that the default storage round-trips through config.json."""
+    config = ConfigManager()
+    assert isinstance(config.storage, JsonFileStorage)
+    config.set('window_duration_ms', 1200)
+    config.add_custom_noise("mrrp")
+    config.close()
+    
+    assert config.get_config_path().exists()
     config2 = ConfigManager()
     assert config2.get('window_duration_ms') == 1200
+    assert config2.get_custom_noises() == ["mrrp"]
+
 
+def test_defaults_are_not_shared(config_factory):
+    """Test that changing one manager's defaults leaves DEFAULT_CONFIG alone."""
+    config = config_factory()
+    config.add_custom_noise("mraaow")
+    assert DEFAULT_CONFIG['custom_noises'] == []
+    assert config_factory().get_custom_noises() == []
+    assert config.get_config_path() is None
 
-def test_custom_noises(temp_config):
+
+def test_custom_noises(config_factory):
     """Test adding and removing custom noises."""
-    config = ConfigManager()
+    config = config_factory()
     assert config.add_custom_noise("mraaow")
     assert "mraaow" in config.get_custom_noises()
     assert config.remove_custom_noise("mraaow")
     assert "mraaow" not in config.get_custom_noises()
 
 
-def test_custom_noise_duplicate(temp_config):
+def test_custom_noise_duplicate(config_factory):
     """Test that duplicate noises are not added."""
-    config = ConfigManager()
+    config = config_factory()
     assert config.add_custom_noise("meowww")
     assert not config.add_custom_noise("meowww")  # Should return False
     assert config.get_custom_noises().count("meowww") == 1
 
 
-def test_reset_to_defaults(temp_config):
+def test_reset_to_defaults(config_factory):
     """Test resetting config to defaults."""
-    config = ConfigManager()
+    config = config_factory()
     config.set('window_duration_ms', 9999)
     config.reset_to_defaults()
     assert config.get('window_duration_ms') == DEFAULT_CONFIG['window_duration_ms']
 
 
-def test_update_multiple_values(temp_config):
+def test_update_multiple_values(config_factory):
     """Test updating multiple config values at once."""
-    config = ConfigManager()
+    config = config_factory()
     config.update({
         'window_duration_ms': 1000,
         'typing_delay_ms': 50
@@ -73,7 +132,87 @@ def test_update_multiple_values(temp_config):
     assert config.get('typing_delay_ms') == 50
 
 
-def test_get_with_default(temp_config):
+def test_get_with_default(config_factory):
     """Test getting a non-existent key with default."""
-    config = ConfigManager()
+    config = config_factory()
     assert config.get('nonexistent_key', 'default_value') == 'default_value'
+
+
+def test_external_edit_invalidates_cache(temp_config):
+    """Test that a hand-edited config file is re-read, not served from cache."""
+    config = ConfigManager()
+    config.set('window_duration_ms', 1200)
+    config.close()
+    
+    # Edit the file behind the manager's back (different size, new mtime)
+    data = json.loads(config.get_config_path().read_text(encoding='utf-8'))
+    data['window_duration_ms'] = 15000
+    config.get_config_path().write_text(json.dumps(data), encoding='utf-8')
+    
+    assert ConfigManager().get('window_duration_ms') == 15000
+
+
+@pytest.mark.parametrize("cache_bytes", [
+    b"\x80\x05",  # truncated
+    b"cbuiltins\nno_such_thing\n.",  # AttributeError on load
+    b"cno_such_module\nthing\n.",  # ImportError on load
+])
+def test_corrupted_cache_falls_back_to_json(temp_config, cache_bytes):
+    """Test that an unreadable parse cache doesn't stop the config loading."""
+    config = ConfigManager()
+    config.set('window_duration_ms', 1200)
+    config.close()
+    
+    config.storage.cache_file.write_bytes(cache_bytes)
+    assert ConfigManager().get('window_duration_ms') == 1200
+
+
+def test_save_leaves_cache_to_load(tmp_path):
+    """Test that saving writes only config.json; the cache is filled on load."""
+    storage = JsonFileStorage(tmp_path / "config.json")
+    storage.save({"window_duration_ms": 1200})
+    assert not storage.cache_file.exists()
+    
+    assert storage.load() == {"window_duration_ms": 1200}
+    assert storage.cache_file.exists()
+
+
+def test_rapid_changes_coalesce_into_one_write(config_factory, monkeypatch):
+    """Test that a burst of changes is written to storage once."""
+    config = config_factory()
+    writes = []
+    original_write = config._write_file
+    monkeypatch.setattr(config, '_write_file', lambda: (writes.append(1), original_write()))
+    
+    for ms in range(1000, 1500, 100):
+        config.set('window_duration_ms', ms)
+    
+    time.sleep(SAVE_DEBOUNCE_S * 3)
+    assert len(writes) == 1
+    assert config.storage.load()['window_duration_ms'] == 1400
+
+
+def test_stdlib_json_fallback(temp_config, monkeypatch):
+    """Test that config round-trips without orjson installed."""
+    from src.kittymode import config as config_module
+    monkeypatch.setattr(config_module, 'orjson', None)
+    
+    config = ConfigManager()
+    config.add_custom_noise("nyaa~ 🐱")
+    config.close()
+    
+    assert "nyaa~ 🐱" in ConfigManager().get_custom_noises()
+
+
+def test_close_releases_the_exit_hook():
+    """Test that a closed manager isn't kept alive by its atexit hook."""
+    import gc
+    import weakref
+    
+    config = ConfigManager(storage=DictStorage())
+    config.set('window_duration_ms', 1000)
+    config.close()
+    ref = weakref.ref(config)
+    del config
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,86 @@
+"""Tests for the cat noise database generator."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.kittymode import generate_noises
+from src.kittymode.generate_noises import (
+    INTERNATIONAL_NOISES,
+    SEED,
+    TARGET_NOISE_COUNT,
+    _VOWEL_LUT,
+    _dumps,
+    _input_hash,
+    _stretch_ascii,
+    generate_all_noises,
+    generate_international_noises,
+)
+
+
+def _generate_seeded() -> list[dict]:
+    """Generate the noise list the way main() does, from SEED."""
+    random.seed(SEED)
+    return generate_all_noises(np.random.default_rng(SEED))["noises"]
+
+
+def test_same_seed_generates_same_noises():
+    """Test that generation is reproducible for a fixed seed."""
+    assert _generate_seeded() == _generate_seeded()
+
+
+def test_generates_target_count_of_unique_noises():
+    """Test that exactly TARGET_NOISE_COUNT noises come out, none repeated."""
+    noises = _generate_seeded()
+    texts = [noise["text"] for noise in noises]
+    assert len(texts) == TARGET_NOISE_COUNT
+    assert len(set(texts)) == len(texts)
+
+
+def test_stretch_ascii_repeats_only_chosen_eligible_characters():
+    """Test that only masked characters found in the lookup table are repeated."""
+    assert _stretch_ascii("meow", _VOWEL_LUT, [True] * 4, [3] * 4) == "meeeooow"
+    assert _stretch_ascii("meow", _VOWEL_LUT, [False, True, False, False], [2, 4, 2, 2]) == "meeeeow"
+    assert _stretch_ascii("meow", _VOWEL_LUT, [False] * 4, [5] * 4) == "meow"
+
+
+def test_international_elongation_keeps_non_ascii_letters():
+    """Test that non-ASCII noises are stretched only on their ASCII vowels."""
+    out = {}
+    generate_international_noises(out, np.random.default_rng(SEED))
+    
+    by_base = {}
+    for text, category, base, variation in out.values():
+        assert category == "international"
+        by_base.setdefault(base, []).append((text, variation))
+    
+    for noise, language in INTERNATIONAL_NOISES:
+        assert (noise, language) in by_base[noise]
+    
+    elongated = [text for text, variation in by_base["mňau"] if variation == "czech_elongated"]
+    assert elongated
+    for text in elongated:
+        # The háček letter is never repeated or mangled
+        assert text.count("ň") == 1
+        assert text.replace("a", "").replace("u", "") == "mň"
+    
+    # "á" isn't in the ASCII vowel table, so "mjá" has nothing to stretch
+    assert by_base["mjá"] == [("mjá", "icelandic")]
+
+
+@pytest.mark.skipif(generate_noises.orjson is None, reason="orjson not installed")
+def test_orjson_and_json_write_same_bytes(monkeypatch):
+    """Test that the output doesn't depend on whether orjson is installed."""
+    data = generate_all_noises(np.random.default_rng(SEED))
+    with_orjson = _dumps(data)
+    monkeypatch.setattr(generate_noises, "orjson", None)
+    assert _dumps(data) == with_orjson
+
+
+def test_input_hash_tracks_the_noise_lists(monkeypatch):
+    """Test that the input hash is stable and changes with the base noises."""
+    original = _input_hash()
+    assert _input_hash() == original
+    monkeypatch.setattr(generate_noises, "BASE_NOISES", generate_noises.BASE_NOISES + ["mrrrowl"])
+    assert _input_hash() != original
@@ -4,16 +4,12 @@
 import time
 
 
-def test_full_pipeline():
+@pytest.mark.timing
+def test_full_pipeline(selector):
     """Test the full pipeline from key capture to noise output."""
     from src.kittymode.capture_window import CaptureWindow
-    from src.kittymode.similarity_search import CatNoiseFinder
-    from src.kittymode.noise_selector import NoiseSelector
     
-    # Set up pipeline - pre-load the model to avoid timing issues
-    finder = CatNoiseFinder()
-    finder._ensure_loaded()  # Pre-load model
-    selector = NoiseSelector(finder)
+    # The selector fixture's finder is pre-loaded, avoiding timing issues
     output_results = []
     
     def on_capture_complete(captured, count):
@@ -42,12 +38,8 @@ def on_capture_complete(captured, count):
     print(f"Input: '{output_results[0]['input']}' -> Output: '{output_results[0]['output']}'")
 
 
-def test_similarity_search_pipeline():
+def test_similarity_search_pipeline(finder):
     """Test the similarity search returns relevant results."""
-    from src.kittymode.similarity_search import CatNoiseFinder
-    
-    finder = CatNoiseFinder()
-    
     # Test with "meow" should return similar cat noises
     results = finder.find_similar("meow", top_k=5)
     assert len(results) == 5
@@ -59,13 +51,8 @@ def test_similarity_search_pipeline():
         assert len(result['text']) > 0
 
 
-def test_noise_categories():
+def test_noise_categories(finder):
     """Test that different noise categories are accessible."""
-    from src.kittymode.similarity_search import CatNoiseFinder
-    
-    finder = CatNoiseFinder()
-    finder._ensure_loaded()
-    
     # Check that we have multiple categories
     categories = set(n['category'] for n in finder.noises)
     assert 'base' in categories
@@ -89,15 +76,11 @@ def test_config_to_capture_window():
     assert window.max_duration_ms == 2000
 
 
-def test_multiple_capture_cycles():
+@pytest.mark.timing
+def test_multiple_capture_cycles(selector):
     """Test multiple complete capture cycles."""
     from src.kittymode.capture_window import CaptureWindow
-    from src.kittymode.noise_selector import NoiseSelector
-    from src.kittymode.similarity_search import CatNoiseFinder
     
-    finder = CatNoiseFinder()
-    finder._ensure_loaded()  # Pre-load model
-    selector = NoiseSelector(finder)
     results = []
     
     def on_complete(captured, count):
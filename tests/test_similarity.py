@@ -1,18 +1,433 @@
 """Tests for vector similarity search."""
 
+import ctypes
+import json
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
 
-from src.kittymode.similarity_search import CatNoiseFinder
+from src.kittymode.generate_embeddings import quantize_rows, save_noise_index
+from src.kittymode.similarity_search import (
+    EMBED_CACHE_SIZE,
+    WARMUP_TEXTS,
+    CatNoiseFinder,
+    ONNXEmbedder,
+    _load_noise_index,
+    _normalize_rows,
+    _SubstringIndex,
+    _resolve_optimization_level,
+    _session_optimization_level,
+    _top_k,
+)
 from src.kittymode.noise_selector import NoiseSelector
 
 
-class TestCatNoiseFinder:
-    """Tests for CatNoiseFinder class."""
+def test_noise_index_round_trip(tmp_path):
+    """Test that noises.npz as written by generate_embeddings loads back in order."""
+    noises = [
+        {"text": "meow", "category": "base", "base_noise": "meow", "variation_type": None},
+        {"text": "nyaa~ 🐱", "category": "international", "base_noise": "nya", "variation_type": "emoji"},
+        {"text": "mew", "category": "base", "base_noise": "mew", "variation_type": None},
+    ]
+    index_path = tmp_path / "noises.npz"
+    save_noise_index(index_path, noises)
+    
+    texts, loaded = _load_noise_index(index_path)
+    assert texts == ["meow", "nyaa~ 🐱", "mew"]
+    assert loaded == noises
+
+
+def test_legacy_noise_index_still_loads(tmp_path):
+    """Test that an index with one JSON object per noise still loads."""
+    noises = [
+        {"text": "meow", "category": "base", "base_noise": "meow", "variation_type": "base"},
+        {"text": "nyaa~ 🐱", "category": "international", "base_noise": "nya", "variation_type": "emoji"},
+    ]
+    index_path = tmp_path / "noises.npz"
+    np.savez_compressed(
+        index_path,
+        texts=np.array([n["text"] for n in noises]),
+        meta=np.array([json.dumps(n, ensure_ascii=False) for n in noises])
+    )
+    
+    texts, loaded = _load_noise_index(index_path)
+    assert texts == ["meow", "nyaa~ 🐱"]
+    assert loaded == noises
+
+
+def test_normalize_rows_gives_float32_unit_rows():
+    """Test that stored float16 embeddings become unit-length float32 rows."""
+    stored = np.array([[3.0, 4.0], [0.0, 2.0]], dtype=np.float16)
+    normalized = _normalize_rows(stored)
+    assert normalized.dtype == np.float32
+    assert normalized.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(normalized, [[0.6, 0.8], [0.0, 1.0]], rtol=1e-6)
+    assert stored.dtype == np.float16  # input left untouched
+
+
+def test_int8_rows_keep_their_direction():
+    """Test that int8 embeddings from generate_embeddings load back near the originals."""
+    rng = np.random.default_rng(0)
+    original = _normalize_rows(rng.standard_normal((20, 384)))
+    restored = _normalize_rows(quantize_rows(original))
+    assert np.einsum("ij,ij->i", original, restored).min() > 0.999
+
+
+def test_int8_rows_keep_rankings():
+    """Test that searching the int8-stored rows finds the same best matches."""
+    rng = np.random.default_rng(1)
+    original = _normalize_rows(rng.standard_normal((500, 384)))
+    restored = _normalize_rows(quantize_rows(original))
+    queries = _normalize_rows(original[:50] + 0.5 * rng.standard_normal((50, 384)) / np.sqrt(384))
+    
+    assert ((queries @ restored.T).argmax(axis=1) == np.arange(50)).all()
+    assert np.diag(original[:50] @ restored[:50].T).min() > 0.99
+
+
+class _CountingEmbedder:
+    """Embedder stand-in that counts how often the model runs."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def encode_batch(self, texts):
+        self.calls += 1
+        # Deterministic per text, so batched and single results agree
+        return np.array([[len(t) + 2.0, t.count("m") + 1.0] for t in texts], dtype=np.float32)
+    
+    def encode(self, text):
+        return self.encode_batch([text])[0]
+
+
+def test_query_embeddings_are_cached():
+    """Test that repeated queries skip the model and the cache stays bounded."""
+    finder = CatNoiseFinder()
+    finder.model = _CountingEmbedder()
+    
+    first = finder._embed_query("ab")
+    np.testing.assert_allclose(first, np.array([4.0, 1.0]) / np.sqrt(17), rtol=1e-6)
+    assert finder._embed_query("ab") is first
+    assert finder.model.calls == 1
+    
+    for i in range(EMBED_CACHE_SIZE):
+        finder._embed_query(f"query {i}")
+    assert len(finder._embed_cache) == EMBED_CACHE_SIZE
+    assert "ab" not in finder._embed_cache
+
+
+def test_query_cache_is_lru_and_read_only():
+    """Test that hits keep entries alive and cached embeddings can't be changed."""
+    finder = CatNoiseFinder()
+    finder.model = _CountingEmbedder()
+    
+    first = finder._embed_query("ab")
+    with pytest.raises(ValueError):
+        first[0] = 0.0
+    
+    for i in range(EMBED_CACHE_SIZE - 1):
+        finder._embed_query(f"query {i}")
+    finder._embed_query("ab")  # Most recently used again
+    finder._embed_query("one more")
+    assert "ab" in finder._embed_cache
+    assert "query 0" not in finder._embed_cache
+    
+    calls = finder.model.calls
+    finder.invalidate_cache()
+    assert finder._embed_query("ab") is not first
+    assert finder.model.calls == calls + 1
+
+
+@pytest.mark.parametrize("level", ["basic", "extended", "all"])
+def test_explicit_optimization_level_is_kept(level):
+    """Test that a configured optimization level is used as-is."""
+    assert _resolve_optimization_level(level) == level
+
+
+def test_auto_optimization_level_is_concrete():
+    """Test that auto and unknown levels resolve to a real ONNX Runtime level."""
+    assert _resolve_optimization_level("auto") in {"extended", "all"}
+    assert _resolve_optimization_level("turbo") == _resolve_optimization_level("auto")
+
+
+def test_pre_optimized_model_only_reruns_all():
+    """Test that the export-optimized model is only re-optimized for "all"."""
+    assert _session_optimization_level("model_opt.onnx", "extended") is None
+    assert _session_optimization_level("model_opt.onnx", "basic") is None
+    assert _session_optimization_level("model_opt.onnx", "all") == "all"
+    assert _session_optimization_level("model_int8.onnx", "basic") == "basic"
+
+
+class _FakeTokenizer:
+    """Tokenizer stand-in: one token per character, right-padded with zeros."""
+    
+    def __call__(self, texts, **kwargs):
+        if isinstance(texts, str):
+            return {"input_ids": [1] * len(texts), "attention_mask": [1] * len(texts)}
+        length = max(len(t) for t in texts)
+        ids = np.array([[1] * len(t) + [0] * (length - len(t)) for t in texts])
+        return {"input_ids": ids, "attention_mask": (ids > 0).astype(np.int64)}
+
+
+def _view(ptr, ctype, shape):
+    """View raw memory bound through an IO binding as an array."""
+    return np.ctypeslib.as_array(ctypes.cast(ptr, ctypes.POINTER(ctype)), shape)
+
+
+class _FakeBinding:
+    """IO binding stand-in that runs its session on the bound memory."""
+    
+    def __init__(self, session):
+        self.session = session
+        self.inputs = {}
+        self.output = None
+        self.outputs = []
+    
+    def bind_input(self, name, device_type, device_id, element_type, shape, buffer_ptr):
+        self.inputs[name] = (shape, buffer_ptr)
+    
+    def bind_output(self, name, device_type="cpu", device_id=0, element_type=None, shape=None, buffer_ptr=None):
+        self.output = (shape, buffer_ptr) if buffer_ptr else None
+    
+    def run(self):
+        feed = {name: _view(ptr, ctypes.c_int64, shape) for name, (shape, ptr) in self.inputs.items()}
+        self.outputs = self.session.run(None, feed)
+        if self.output:
+            shape, ptr = self.output
+            _view(ptr, ctypes.c_float, shape)[:] = self.outputs[0]
+    
+    def copy_outputs_to_cpu(self):
+        return self.outputs
+
+
+class _FakeSession:
+    """Session stand-in returning fixed random hidden states per shape."""
+    
+    output_shape = ["batch", "sequence", 4]
+    
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+    
+    def get_outputs(self):
+        return [SimpleNamespace(name="output", shape=self.output_shape)]
+    
+    def io_binding(self):
+        return _FakeBinding(self)
+    
+    def run_with_iobinding(self, binding):
+        binding.run()
+    
+    def run(self, output_names, feed):
+        shape = feed["input_ids"].shape
+        return [np.random.default_rng(shape[1]).standard_normal((*shape, 4)).astype(np.float32)]
+
+
+def _fake_embedder(session):
+    """Build an ONNXEmbedder around a fake session and tokenizer."""
+    embedder = ONNXEmbedder.__new__(ONNXEmbedder)
+    embedder.tokenizer = _FakeTokenizer()
+    embedder.session = session
+    embedder._bind_buffers()
+    return embedder
+
+
+def test_encode_batch_mean_pools_real_tokens():
+    """Test that padding tokens are left out of each row's mean."""
+    embedder = _fake_embedder(_FakeSession())
+    
+    pooled = embedder.encode_batch(["meow", "mew", "m"])
+    hidden = _FakeSession().run(None, {"input_ids": np.zeros((3, 4))})[0]
+    np.testing.assert_allclose(pooled[0], hidden[0].mean(axis=0), rtol=1e-5)
+    np.testing.assert_allclose(pooled[1], hidden[1, :3].mean(axis=0), rtol=1e-5)
+    np.testing.assert_allclose(pooled[2], hidden[2, :1].mean(axis=0), rtol=1e-5)
+    
+    single = embedder.encode("meow")
+    np.testing.assert_allclose(single, hidden[0].mean(axis=0), rtol=1e-5)
+
+
+def test_encode_batch_passes_through_pooled_graph_output():
+    """Test that models exporting pooled embeddings are used as-is."""
+    pooled = np.arange(8, dtype=np.float32).reshape(2, 4)
+    
+    class _PooledSession(_FakeSession):
+        output_shape = ["batch", 4]
+        
+        def run(self, output_names, feed):
+            return [pooled if len(feed["input_ids"]) > 1 else pooled[:1]]
+    
+    embedder = _fake_embedder(_PooledSession())
+    assert embedder.encode_batch(["meow", "mew"]) is pooled
+    
+    single = embedder.encode("meow")
+    np.testing.assert_array_equal(single, pooled[0])
+    assert not np.shares_memory(single, embedder._out_buf)
+
+
+def test_encode_binds_buffers_in_place():
+    """Test that single-text encoding reuses its buffers, sliced to the text."""
+    feeds = []
+    
+    class _RecordingSession(_FakeSession):
+        def run(self, output_names, feed):
+            feeds.append(feed)
+            return super().run(output_names, feed)
+    
+    embedder = _fake_embedder(_RecordingSession())
+    embedder.encode("meow")
+    embedder.encode("mew")
+    
+    assert [f["input_ids"].shape for f in feeds] == [(1, 4), (1, 3)]
+    assert all(np.shares_memory(f["input_ids"], embedder._ids_buf) for f in feeds)
+    assert feeds[1]["attention_mask"].sum() == 3
+
+
+def test_warm_up_runs_throwaway_inferences():
+    """Test that warming up runs the model without changing later results."""
+    runs = []
+    
+    class _CountingSession(_FakeSession):
+        def run(self, output_names, feed):
+            runs.append(feed["input_ids"].shape)
+            return super().run(output_names, feed)
+    
+    embedder = _fake_embedder(_CountingSession())
+    before = embedder.encode("meow")
+    embedder.warm_up()
+    assert len(runs) == 1 + len(WARMUP_TEXTS)
+    np.testing.assert_array_equal(embedder.encode("meow"), before)
+
+
+@pytest.mark.parametrize("k", [0, 1, 3, 6, 10])
+def test_top_k_matches_full_sort(k):
+    """Test that top-k selection agrees with sorting everything."""
+    values = np.random.default_rng(k).random(6).astype(np.float32)
+    np.testing.assert_array_equal(_top_k(values, k), np.argsort(values)[::-1][:k])
+
+
+@pytest.mark.parametrize("query", ["meow", "m", "mrrp meow", "xyz", "nyaa~ purr", "\0m"])
+def test_substring_index_matches_direct_scan(query):
+    """Test that indexed partial matches agree with checking every text."""
+    texts = ["Meow", "mrrp", "mrrp", "nya", "purr", "m", "meowmeow", "nyaa~"]
+    expected = [i for i, t in enumerate(texts) if query in t.lower() or t.lower() in query]
+    assert _SubstringIndex(texts).hits(query) == expected
+
+
+def _fake_loaded_finder(texts):
+    """Build a CatNoiseFinder over the given texts without any data files."""
+    finder = CatNoiseFinder()
+    finder.model = _CountingEmbedder()
+    finder.noises = [
+        {"text": t, "category": "base", "base_noise": t, "variation_type": None} for t in texts
+    ]
+    finder.embeddings = _normalize_rows(finder.model.encode_batch(texts))
+    finder.model.calls = 0
+    return finder
+
+
+def test_find_similar_batch_matches_single_queries():
+    """Test that batched search agrees with one-at-a-time search in one model call."""
+    finder = _fake_loaded_finder(["meow", "mrrp", "nya", "purrr"])
+    inputs = ["mmm", "hello", "mmm", "nyan"]
+    
+    batched = finder.find_similar_batch(inputs, top_k=3)
+    assert finder.model.calls == 1
+    assert batched == [finder.find_similar(text, top_k=3) for text in inputs]
+    assert finder.model.calls == 1  # every single query was a cache hit
+
+
+def test_near_repeat_queries_reuse_previous_results():
+    """Test that a one-keystroke variation of a long query skips the search."""
+    finder = _fake_loaded_finder(["meow", "mrrp", "nya", "purrr"])
+    
+    first = finder.find_similar("keyboard smash", top_k=3)
+    assert finder.find_similar("keyboard smashh", top_k=3) == first
+    assert "keyboard smashh" not in finder._embed_cache
+    
+    # Short inputs, other top_k values and bigger edits still search
+    finder.find_similar("mew", top_k=3)
+    finder.find_similar("mow", top_k=3)
+    finder.find_similar("mow", top_k=2)
+    assert finder.find_similar("keyboard crash", top_k=3)
+    assert {"mow", "keyboard crash"} <= set(finder._embed_cache)
+
+
+def test_custom_noises_append_without_copying_every_time():
+    """Test that custom noise rows land after the originals with spare capacity."""
+    finder = _fake_loaded_finder(["meow", "mrrp"])
+    original = finder.embeddings.copy()
+    
+    finder.add_custom_noises(["nyoom"])
+    buffer = finder._embedding_buffer
+    finder.add_custom_noises(["blorp"])
+    assert finder._embedding_buffer is buffer  # second add fit in spare capacity
     
-    @pytest.fixture
-    def finder(self):
-        """Create a CatNoiseFinder instance."""
-        return CatNoiseFinder()
+    expected = np.vstack([original, _normalize_rows(finder.model.encode_batch(["nyoom", "blorp"]))])
+    np.testing.assert_allclose(finder.embeddings, expected)
+    assert [n["text"] for n in finder.noises] == ["meow", "mrrp", "nyoom", "blorp"]
+    
+    finder.set_custom_noises(["zoom"])
+    assert [n["text"] for n in finder.noises] == ["meow", "mrrp", "zoom"]
+    assert len(finder.embeddings) == 3
+
+
+def test_filters_follow_custom_noise_changes():
+    """Test that category and length filters see added and replaced custom noises."""
+    finder = _fake_loaded_finder(["meow", "mrrp", "purrrrr"])
+    assert [n["text"] for n in finder.get_short_noises(4)] == ["meow", "mrrp"]
+    
+    finder.add_custom_noises(["nya", "blorpity"])
+    assert [n["text"] for n in finder.get_noise_by_category("custom")] == ["nya", "blorpity"]
+    assert [n["text"] for n in finder.get_short_noises(4)] == ["meow", "mrrp", "nya"]
+    
+    finder.set_custom_noises(["zoom"])
+    assert [n["text"] for n in finder.get_noise_by_category("custom")] == ["zoom"]
+    assert [n["text"] for n in finder.get_noise_by_category("base")] == ["meow", "mrrp", "purrrrr"]
+    assert finder.get_noise_by_category("elongation") == []
+
+
+def test_model_loads_only_for_novel_queries(tmp_path, monkeypatch):
+    """Test that data-only work and known noise texts don't load the model."""
+    from src.kittymode import similarity_search
+    
+    texts = ["meow", "mrrp", "nya", "purrr"]
+    save_noise_index(tmp_path / "noises.npz", [
+        {"text": t, "category": "base", "base_noise": t, "variation_type": None} for t in texts
+    ])
+    np.save(tmp_path / "embeddings.npy", quantize_rows(_CountingEmbedder().encode_batch(texts)))
+    loads = []
+    monkeypatch.setattr(similarity_search, "_get_model_path", lambda: tmp_path)
+    monkeypatch.setattr(
+        similarity_search, "ONNXEmbedder", lambda *args, **kwargs: loads.append(1) or _CountingEmbedder()
+    )
+    finder = CatNoiseFinder(
+        embeddings_path=tmp_path / "embeddings.npy", index_path=tmp_path / "noises.npz"
+    )
+    
+    assert finder.get_short_noises(3)
+    assert finder.find_similar("mrrp", top_k=2)[0]["text"] == "mrrp"
+    assert finder.find_similar_batch(["meow", "nya"], top_k=1)
+    assert finder.model is None
+    
+    finder.find_similar("keyboard smash", top_k=2)
+    finder.find_similar("hello", top_k=2)
+    assert loads == [1]
+    assert finder.model.calls == 2
+
+
+def test_empty_input_samples_base_noises():
+    """Test that empty input draws only base noises, without running the model."""
+    finder = _fake_loaded_finder(["meow", "mrrp", "nya"])
+    finder.set_custom_noises(["zoom", "blorp"])
+    finder.model.calls = 0
+    
+    results = finder.find_similar("", top_k=5)
+    assert sorted(r["text"] for r in results) == ["meow", "mrrp", "nya"]
+    assert all(r["weight"] == 0.25 for r in results)
+    assert finder.model.calls == 0
+
+
+class TestCatNoiseFinder:
+    """Tests for CatNoiseFinder class, using the shared finder fixture."""
     
     def test_find_similar_returns_results(self, finder):
         """Test that find_similar returns results for keyboard smash input."""
@@ -27,6 +442,7 @@ def test_find_similar_returns_correct_structure(self, finder):
         for r in results:
             assert "text" in r
             assert "score" in r
+            assert r["weight"] == pytest.approx(r["score"] ** 2)
             assert "category" in r
             assert "base_noise" in r
             assert "variation_type" in r
@@ -77,16 +493,16 @@ def test_get_short_noises(self, finder):
         short = finder.get_short_noises(max_length=4)
         assert len(short) > 0
         assert all(len(n["text"]) <= 4 for n in short)
+    
+    def test_has_short_match(self, finder):
+        """Test the cheap short-noise pre-check."""
+        assert finder.has_short_match("mrrp")
+        assert finder.has_short_match("MEW!")
+        assert not finder.has_short_match("qzxv")
 
 
 class TestNoiseSelector:
-    """Tests for NoiseSelector class."""
-    
-    @pytest.fixture
-    def selector(self):
-        """Create a NoiseSelector instance."""
-        finder = CatNoiseFinder()
-        return NoiseSelector(finder)
+    """Tests for NoiseSelector class, using the selector fixture."""
     
     def test_selector_returns_string(self, selector):
         """Test that select_noise returns a non-empty string."""
@@ -103,7 +519,7 @@ def test_empty_input_returns_noise(self, selector):
     def test_short_input_returns_short_noise(self, selector):
         """Test that very short input returns short noises."""
         # Run multiple times due to randomness
-        results = [selector.select_noise("a") for _ in range(10)]
+        results = selector.select_noises_batch("a", 10)
         # Most should be short
         short_count = sum(1 for r in results if len(r) <= 6)
         assert short_count >= 5  # At least half should be short
@@ -111,7 +527,7 @@ def test_short_input_returns_short_noise(self, selector):
     def test_long_input_may_return_compound(self, selector):
         """Test that long input may return compound noises."""
         # Run many times to trigger compound logic
-        results = [selector.select_noise("a" * 20) for _ in range(50)]
+        results = selector.select_noises_batch("a" * 20, 50)
         # Some should contain spaces (compound noises)
         compound_count = sum(1 for r in results if " " in r)
         # With 30% chance, we should see some compounds
@@ -127,7 +543,7 @@ def test_different_inputs_different_outputs(self, selector):
     
     def test_randomness_produces_variety(self, selector):
         """Test that repeated calls with same input produce variety."""
-        results = [selector.select_noise("test input") for _ in range(20)]
+        results = selector.select_noises_batch("test input", 20)
         unique_results = set(results)
         # Should have at least some variety due to randomness
         assert len(unique_results) >= 2